@@ -0,0 +1,5 @@
+"""
+Generate pseudorandom data from .json schemas.
+"""
+
+__version__ = "1.0.6"
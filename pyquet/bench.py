@@ -0,0 +1,252 @@
+"""
+Pyquet benchmarks.
+
+Times the generator, writer, reader and editor hot paths and reports rows/s, MB/s and peak RSS
+as JSON, e.g. python -m pyquet.bench --sizes 10000,100000 --output bench.json
+
+The rows of the reader case are the number of schemas read, and the rows of the cli_help case the
+number of PyquetGenerate --help processes started one after the other, timing the CLI startup.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pyarrow as pa
+
+from pyquet import __version__
+from pyquet.modules.stats import peak_rss, tree_size
+
+DEFAULT_SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+DEFAULT_SCHEMA_COUNTS = [10, 100, 1000, 10000]
+STARTUP_RUNS = 10
+BENCH_CHUNK_ROWS = 1024 * 1024
+BENCH_SCHEMA = {
+    "name": "bench_table",
+    "fields": [
+        {"name": "alphanumeric_field", "logicalFormat": "ALPHANUMERIC(10)"},
+        {"name": "numeric_short_field", "logicalFormat": "NUMERIC SHORT"},
+        {"name": "decimal_field", "logicalFormat": "DECIMAL(12,2)"},
+        {"name": "date_field", "logicalFormat": "DATE"},
+        {"name": "timestamp_field", "logicalFormat": "TIMESTAMP"},
+        {"name": "time_field", "logicalFormat": "TIME"},
+        {"name": "gf_cutoff_date", "logicalFormat": "DATE"}
+    ]
+}
+BENCH_CUTOFF_DATES = [f"2025-{month:02d}-28" for month in range(1, 13)]
+GENERATE_METHODS = {
+    "generate_alphanumeric": ("alphanumeric_field", 10),
+    "generate_int": ("numeric_short_field",),
+    "generate_decimal": ("decimal_field", 12, 2),
+    "generate_date": ("date_field",),
+    "generate_timestamp": ("timestamp_field",),
+    "generate_time": ("time_field",),
+}
+CASES = list(GENERATE_METHODS) + ["generate_data_csv", "generate_data_parquet",
+                                  "reader", "editor_set_constants", "cli_help"]
+
+
+def run_benchmarks(sizes=None, schema_counts=None, cases=None, work_dir=None):
+    """
+    Runs every benchmark case in a fresh process, so that its peak RSS is its own.
+
+    :param sizes: Numbers of rows of the generator and editor cases, defaults to 1e4 to 1e7
+    :type sizes: list, optional
+    :param schema_counts: Numbers of schemas of the reader case, defaults to 10 to 10000
+    :type schema_counts: list, optional
+    :param cases: Regex of the names of the cases to run, defaults to every case
+    :type cases: str, optional
+    :param work_dir: Directory of the generated data, defaults to a temporary directory
+    :type work_dir: str, optional
+    :return: Report with the environment and the results of every case
+    :rtype: dict
+    """
+    runs = []
+    for case in CASES:
+        if cases and not re.search(cases, case):
+            continue
+        if case == "reader":
+            case_sizes = schema_counts or DEFAULT_SCHEMA_COUNTS
+        elif case == "cli_help":
+            case_sizes = [STARTUP_RUNS]
+        else:
+            case_sizes = sizes or DEFAULT_SIZES
+        runs.extend((case, size) for size in case_sizes)
+
+    results = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as bench_dir:
+        for case, size in runs:
+            case_dir = os.path.join(bench_dir, f"{case}-{size}")
+            with ProcessPoolExecutor(max_workers=1,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                results.append(executor.submit(_run_case, case, size, case_dir).result())
+            print(json.dumps(results[-1]), file=sys.stderr)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "pyarrow": pa.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+    }
+
+
+def _run_case(case, size, case_dir):
+    """
+    Runs a benchmark case, timing only the measured call.
+
+    :return: Result of the case with its rows, seconds, bytes, rows/s, MB/s and peak RSS
+    :rtype: dict
+    """
+    os.makedirs(case_dir)
+    result = {"case": case, "rows": size, "seconds": None, "bytes": None,
+              "rows_per_second": None, "mb_per_second": None, "peak_rss_bytes": None,
+              "error": None}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if case in GENERATE_METHODS:
+                seconds, num_bytes = _bench_generate_method(case, size)
+            elif case.startswith("generate_data_"):
+                seconds, num_bytes = _bench_generate_data(case[len("generate_data_"):], size,
+                                                          case_dir)
+            elif case == "reader":
+                seconds, num_bytes = _bench_reader(size, case_dir)
+            elif case == "cli_help":
+                seconds, num_bytes = _bench_cli_help(size)
+            else:
+                seconds, num_bytes = _bench_editor(size, case_dir)
+        result["seconds"] = seconds
+        result["bytes"] = num_bytes
+        result["rows_per_second"] = size / seconds if seconds else None
+        if num_bytes is not None and seconds:
+            result["mb_per_second"] = num_bytes / seconds / 1e6
+    except Exception as e:  # pylint: disable=broad-except
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["peak_rss_bytes"] = peak_rss()
+    return result
+
+
+def _bench_generate_method(method, num_rows):
+    from pyquet.modules.generator import DataGenerator  # pylint: disable=import-outside-toplevel
+    generator = DataGenerator(num_rows=num_rows, seed=0)
+    start = time.perf_counter()
+    getattr(generator, method)(*GENERATE_METHODS[method])
+    return time.perf_counter() - start, None
+
+
+def _bench_generate_data(output_type, num_rows, case_dir):
+    from pyquet.modules.generator import DataGenerator  # pylint: disable=import-outside-toplevel
+    schema_path = _write_schema(case_dir)
+    generator = DataGenerator(num_rows=num_rows, chunk_rows=BENCH_CHUNK_ROWS, seed=0)
+    start = time.perf_counter()
+    target_path, _ = generator.generate_data(schema_path, output_type,
+                                             destination_path=os.path.join(case_dir, "data"))
+    return time.perf_counter() - start, tree_size(target_path)[1]
+
+
+def _bench_reader(num_schemas, case_dir):
+    from pyquet.modules.schemas import Reader  # pylint: disable=import-outside-toplevel
+    for counter in range(num_schemas):
+        _write_schema(case_dir, f"bench_table_{counter}")
+    num_bytes = tree_size(case_dir)[1]
+    start = time.perf_counter()
+    Reader(case_dir)
+    return time.perf_counter() - start, num_bytes
+
+
+def _bench_editor(num_rows, case_dir):
+    # pylint: disable=import-outside-toplevel
+    from pyquet.modules.editor import TableEditor
+    from pyquet.modules.generator import DataGenerator
+    schema_path = _write_schema(case_dir)
+    generator = DataGenerator(num_rows=num_rows, limit_rows=False, chunk_rows=BENCH_CHUNK_ROWS,
+                              seed=0)
+    generator.catalog["gf_cutoff_date"] = BENCH_CUTOFF_DATES
+    target_path, schema = generator.generate_data(schema_path, "parquet", ["gf_cutoff_date"],
+                                                  destination_path=os.path.join(case_dir, "data"))
+    num_bytes = tree_size(target_path)[1]
+    start = time.perf_counter()
+    editor = TableEditor(target_path, schema, ["gf_cutoff_date"])
+    editor.set_constants({"numeric_short_field": 1})
+    return time.perf_counter() - start, num_bytes
+
+
+def _bench_cli_help(num_runs):
+    command = [sys.executable, "-m", "pyquet.pyquet_generator", "--help"]
+    start = time.perf_counter()
+    for _ in range(num_runs):
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start, None
+
+
+def _write_schema(case_dir, name=BENCH_SCHEMA["name"]):
+    schema_path = os.path.join(case_dir, name + ".json")
+    with open(schema_path, "w", encoding="utf-8") as schema_file:
+        json.dump({**BENCH_SCHEMA, "name": name}, schema_file)
+    return schema_path
+
+
+def _int_list(value):
+    return [int(float(item)) for item in value.split(",")]
+
+
+def main():
+    """
+    Main function for the Pyquet benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Pyquet benchmarks")
+
+    parser.add_argument("--sizes",
+                        metavar="SIZES",
+                        type=_int_list,
+                        help="Comma separated numbers of rows, defaults to 1e4,1e5,1e6,1e7",
+                        required=False)
+
+    parser.add_argument("--schema-counts",
+                        metavar="SCHEMA_COUNTS",
+                        type=_int_list,
+                        help="Comma separated numbers of schemas read by the reader case",
+                        required=False)
+
+    parser.add_argument("--cases",
+                        metavar="CASES",
+                        type=str,
+                        help="Regex of the cases to run: " + ", ".join(CASES),
+                        required=False)
+
+    parser.add_argument("--work-dir",
+                        metavar="WORK_DIR",
+                        type=str,
+                        help="Directory of the generated data, defaults to the temporary directory",
+                        required=False)
+
+    parser.add_argument("--output",
+                        "-o",
+                        metavar="OUTPUT",
+                        type=str,
+                        help="Path of the JSON report, defaults to the standard output",
+                        required=False)
+
+    args = parser.parse_args()
+    report = run_benchmarks(args.sizes, args.schema_counts, args.cases, args.work_dir)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+This module contains the BatchGenerator class, which is used to generate the data of many schemas.
+"""
+
+import copy
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+from .schemas import Reader
+from .stats import tree_size
+
+_WORKER_GENERATOR = None
+
+
+class BatchGenerator:
+    """
+    Class for generating the data of every schema read by a Reader.
+    """
+
+    def __init__(self, generator, schemas, regex=".*.json"):
+        """
+        Initialize the BatchGenerator with the generator and the schemas.
+
+        :param generator: Generator with the catalog and settings shared by all the tables
+        :type generator: DataGenerator
+        :param schemas: Directory of schemas, schema path or list of schema paths
+        :type schemas: str or list
+        :param regex: Regex of the schema paths, defaults to '.*.json'
+        :type regex: str, optional
+        """
+        self.generator = generator
+        self.reader = Reader(schemas, regex)
+
+    def generate_data(self,
+                      output_type,
+                      partitions=None,
+                      destination_dir=None,
+                      append=False,
+                      partition_values=None):
+        """
+        Generates the data of every schema, one table per task in a pool of generator.workers
+        processes. The catalog is loaded once and sent once to every worker process.
+
+        :param output_type: Type of output (e.g., 'csv', 'parquet')
+        :type output_type: str
+        :param partitions: List of partition columns, used for the tables that have them,
+            defaults to the partitions of each schema
+        :type partitions: list, optional
+        :param destination_dir: Directory to save the generated data, defaults to the physical
+            path of each schema
+        :type destination_dir: str, optional
+        :param append: Whether to only add the missing partitions of each table, defaults to
+            False
+        :type append: bool, optional
+        :param partition_values: Values of partition columns to generate instead of their
+            catalog values, defaults to None
+        :type partition_values: dict, optional
+        :return: Summary of each table with its path, rows, bytes, seconds and generation stats
+        :rtype: list
+        """
+        table_generator = copy.copy(self.generator)
+        table_generator.workers = 1
+        tasks = []
+        for path, schema in sorted(self.reader.schemas_dict.items()):
+            if not schema.get("fields"):
+                print("Skipping schema without fields:", path)
+                continue
+            plan = self.reader.get_plan(path)
+            table_partitions = [partition
+                                for partition in partitions or schema.get("partitions") or []
+                                if partition in plan.arrow_schema.names]
+            tasks.append((plan, output_type, table_partitions or None, destination_dir, append,
+                          partition_values))
+
+        if not tasks:
+            return []
+        if self.generator.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.generator.workers,
+                                     initializer=_init_worker,
+                                     initargs=(table_generator,)) as executor:
+                return list(executor.map(_generate_table, *zip(*tasks)))
+        _init_worker(table_generator)
+        return [_generate_table(*task) for task in tasks]
+
+    @staticmethod
+    def format_summary(summary):
+        """
+        Formats the summary of a batch as a table.
+
+        :param summary: Summary returned by generate_data
+        :type summary: list
+        :return: Table with the rows, bytes and seconds of each table
+        :rtype: str
+        """
+        width = max([len("table")] + [len(table["table"]) for table in summary])
+        lines = [f"{'table':<{width}} {'rows':>12} {'bytes':>14} {'seconds':>9}"]
+        for table in summary:
+            if table["error"]:
+                lines.append(f"{table['table']:<{width}} failed: {table['error']}")
+            else:
+                lines.append(f"{table['table']:<{width}} {table['rows']:>12} "
+                             f"{table['bytes']:>14} {table['seconds']:>9.2f}")
+        return "\n".join(lines)
+
+
+def _init_worker(generator):
+    global _WORKER_GENERATOR  # pylint: disable=global-statement
+    _WORKER_GENERATOR = generator
+
+
+def _generate_table(plan, output_type, partitions, destination_dir, append, partition_values):
+    """
+    Generates the data of a table with the generator of the worker.
+
+    :return: Summary of the table
+    :rtype: dict
+    """
+    start = time.perf_counter()
+    summary = {"table": plan.name, "path": None, "rows": 0, "bytes": 0, "seconds": 0,
+               "stats": None, "error": None}
+    try:
+        target_path, _ = _WORKER_GENERATOR.generate_data(plan, output_type, partitions,
+                                                         destination_dir=destination_dir,
+                                                         append=append,
+                                                         partition_values=partition_values)
+        summary["path"] = target_path
+        summary["rows"] = _WORKER_GENERATOR.last_stats.rows
+        summary["bytes"] = tree_size(target_path)[1]
+        summary["stats"] = _WORKER_GENERATOR.last_stats.to_dict()
+    except Exception as e:  # pylint: disable=broad-except
+        print("An error occurred generating", plan.name + ":", e)
+        traceback.print_exc()
+        summary["error"] = str(e)
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
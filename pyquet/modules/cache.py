@@ -0,0 +1,129 @@
+"""
+This module contains the DatasetCache class, which is used to reuse previously generated datasets.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+ENTRY_DATA = "data"
+
+
+class DatasetCache:
+    """
+    Content-addressed cache of generated datasets, evicting the least recently used entries.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        """
+        Initialize the DatasetCache.
+
+        :param cache_dir: Directory of the cached datasets
+        :type cache_dir: str
+        :param max_bytes: Maximum size of the cache directory, defaults to no limit
+        :type max_bytes: int, optional
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(**parts):
+        """
+        Computes the key of a dataset from everything its content depends on.
+
+        :param parts: JSON serializable inputs of the generation, other values are serialized
+            with str
+        :return: SHA-256 hex digest of the inputs
+        :rtype: str
+        """
+        content = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def fetch(self, key, target_path):
+        """
+        Links the cached dataset of a key into the target path, copying the files when they
+        cannot be hard linked. The cached files are shared with the target, so they must be
+        replaced and never modified in place.
+
+        :param key: Key of the dataset
+        :type key: str
+        :param target_path: Path of the dataset file or directory
+        :type target_path: str
+        :return: Whether the dataset was in the cache
+        :rtype: bool
+        """
+        entry_data = os.path.join(self.cache_dir, key, ENTRY_DATA)
+        if not os.path.exists(entry_data):
+            return False
+        _link_tree(entry_data, target_path)
+        os.utime(os.path.join(self.cache_dir, key))
+        return True
+
+    def store(self, key, source_path):
+        """
+        Adds a generated dataset to the cache, then evicts the least recently used entries
+        over max_bytes. The entry is staged and renamed, so a concurrent run never sees a
+        partial entry.
+
+        :param key: Key of the dataset
+        :type key: str
+        :param source_path: Path of the generated dataset file or directory
+        :type source_path: str
+        """
+        entry_path = os.path.join(self.cache_dir, key)
+        if os.path.exists(entry_path):
+            return
+        staging_path = os.path.join(self.cache_dir, f".{key}.{uuid.uuid4().hex}")
+        _link_tree(source_path, os.path.join(staging_path, ENTRY_DATA))
+        try:
+            os.rename(staging_path, entry_path)
+        except OSError:
+            shutil.rmtree(staging_path, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in max_bytes.
+        """
+        if self.max_bytes is None:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.startswith(".") and os.path.isdir(path):
+                entries.append((os.path.getmtime(path), _size(path), path))
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= size
+
+
+def _link_tree(source_path, target_path):
+    if os.path.isfile(source_path):
+        os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+        _link(source_path, target_path)
+        return
+    for root, _, files in os.walk(source_path):
+        target_root = os.path.join(target_path, os.path.relpath(root, source_path))
+        os.makedirs(target_root, exist_ok=True)
+        for file in files:
+            _link(os.path.join(root, file), os.path.join(target_root, file))
+
+
+def _link(source_path, target_path):
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        shutil.copy2(source_path, target_path)
+
+
+def _size(path):
+    return sum(os.path.getsize(os.path.join(root, file))
+               for root, _, files in os.walk(path) for file in files)
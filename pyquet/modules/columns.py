@@ -0,0 +1,381 @@
+"""
+This module contains the ColumnEngine class, which is used to generate columns as Arrow arrays.
+"""
+
+import string
+import zlib
+from datetime import date, datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ALPHABET = np.frombuffer((string.ascii_letters + string.digits).encode("ascii"), dtype=np.uint8)
+MAX_STRING_BYTES = 2 ** 31 - 1
+MAX_INT64_PRECISION = 18
+MAX_DECIMAL128_PRECISION = 38
+LOW_WORD_MASK = 2 ** 32 - 1
+BLOCK_ROWS = 2 ** 16
+DATE_RANGE_DAYS = 365 * 5
+SECONDS_PER_DAY = 24 * 60 * 60
+MS_PER_SECOND = 1000
+SEEDED_REFERENCE_NOW = datetime(2025, 1, 1)
+
+
+class ColumnEngine:
+    """
+    Class for generating columns in bulk.
+
+    Every method returns a typed Arrow array with one value per row. Values of fields present in
+    the catalog are cycled with ``row % len(catalog[name])``, where ``row`` is the global index
+    of the row starting at ``offset``, the rest are drawn in bulk from NumPy random generators.
+    Instead of the first row, ``offset`` can be the array of the global indices of the rows,
+    e.g. the rows of a partition spread over the dataset.
+
+    Random values are drawn in blocks of BLOCK_ROWS rows, each one from its own stream derived
+    from the seed, the field name and the index of the block. The value of a row only depends
+    on the seed and its global index, so any range of rows can be generated in isolation and
+    gives the same values whatever the chunks or shards it is split in.
+    """
+
+    def __init__(self, catalog=None, seed=None, reference_now=None):
+        """
+        Initialize the ColumnEngine with the catalog, the seed and the reference date.
+
+        :param catalog: Mapping of field names to lists of values, defaults to None
+        :type catalog: dict, optional
+        :param seed: Seed of the random streams, defaults to a random seed
+        :type seed: int, optional
+        :param reference_now: Date the random dates are counted back from, defaults to
+            SEEDED_REFERENCE_NOW when a seed is given, so that seeded columns are the same on
+            any day, and to the start of the current day otherwise
+        :type reference_now: datetime, optional
+        """
+        self.catalog = catalog if catalog is not None else {}
+        if reference_now is None and seed is not None:
+            reference_now = SEEDED_REFERENCE_NOW
+        elif reference_now is None:
+            reference_now = datetime.combine(date.today(), datetime.min.time())
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+        self.reference_now = np.datetime64(reference_now, "ms")
+        self._pools = {}
+
+    def alphanumeric(self, name, num_rows, size=1, offset=0, cardinality=None):
+        """
+        Generates an alphanumeric column.
+
+        The strings are built in bulk from a matrix of random bytes mapped into the alphabet.
+        With a cardinality, the rows draw their values from a pool of at most cardinality
+        distinct strings, generated once per field and reused by every chunk, and the column
+        is dictionary encoded with the pool as its dictionary.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param size: Length of the alphanumeric strings, defaults to 1
+        :type size: int, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :param cardinality: Number of distinct values of the column, defaults to no limit
+        :type cardinality: int, optional
+        :return: Array of alphanumeric strings, a dictionary array when cardinality is set
+        :rtype: pyarrow.Array
+        """
+        if name in self.catalog:
+            if cardinality:
+                return self._catalog_dictionary(name, num_rows, offset)
+            return self._catalog_values(name, num_rows, offset, pa.string())
+        if cardinality:
+            pool = self._string_pool(name, size, cardinality)
+            indices = self._draw(name, num_rows, offset,
+                                 lambda rng, rows: rng.integers(0, len(pool), size=rows,
+                                                                dtype=np.int32))
+            return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), pool)
+        codes = self._draw(name, num_rows, offset,
+                           lambda rng, rows: rng.integers(0, len(ALPHABET), size=(rows, size),
+                                                          dtype=np.uint8))
+        return _string_array(ALPHABET[codes])
+
+    def integer(self, name, num_rows, size=1000, offset=0):
+        """
+        Generates an integer column.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param size: Maximum value of the integers, defaults to 1000
+        :type size: int, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of integers
+        :rtype: pyarrow.Array
+        """
+        if name in self.catalog:
+            return self._catalog_values(name, num_rows, offset, pa.int64())
+        values = self._draw(name, num_rows, offset,
+                            lambda rng, rows: rng.integers(0, size, size=rows, endpoint=True))
+        return pa.array(values, type=pa.int64())
+
+    def decimal(self, name, num_rows, decimal_precision=12, decimal_scale=6, offset=0):
+        """
+        Generates a decimal column.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param decimal_precision: Precision of the decimals, defaults to 12
+        :type decimal_precision: int, optional
+        :param decimal_scale: Scale of the decimals, defaults to 6
+        :type decimal_scale: int, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of decimals
+        :rtype: pyarrow.Array
+        """
+        decimal_type = decimal_arrow_type(decimal_precision, decimal_scale)
+        if name in self.catalog:
+            return self._catalog_values(name, num_rows, offset, decimal_type)
+        highs = [10 ** min(digits, MAX_INT64_PRECISION)
+                 for digits in range(decimal_precision, 0, -MAX_INT64_PRECISION)]
+        draws = self._draw(name, num_rows, offset,
+                           lambda rng, rows: rng.integers(0, highs, size=(rows, len(highs))))
+        words = [np.zeros(num_rows, dtype=np.uint64) for _ in range(decimal_type.byte_width // 8)]
+        for piece, high in enumerate(highs):
+            words = _multiply_add(words, high, draws[:, piece].astype(np.uint64))
+        data = np.stack(words, axis=1)
+        return pa.Array.from_buffers(decimal_type, num_rows, [None, pa.py_buffer(data)])
+
+    def date(self, name, num_rows, date_format="%Y-%m-%d", offset=0):
+        """
+        Generates a date column.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param date_format: Format of the catalog dates, defaults to '%Y-%m-%d'
+        :type date_format: str, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of dates
+        :rtype: pyarrow.Array
+        """
+        if name in self.catalog:
+            return self._catalog_datetimes(name, num_rows, offset, date_format, pa.date32())
+        days = self._draw(name, num_rows, offset,
+                          lambda rng, rows: rng.integers(0, DATE_RANGE_DAYS, size=rows,
+                                                         endpoint=True))
+        reference_day = self.reference_now.astype("datetime64[D]").astype(np.int64)
+        return pa.array((reference_day - days).astype(np.int32)).view(pa.date32())
+
+    def timestamp(self, name, num_rows, date_format="%Y-%m-%d %H:%M:%S", offset=0):
+        """
+        Generates a timestamp column.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param date_format: Format of the catalog timestamps, defaults to '%Y-%m-%d %H:%M:%S'
+        :type date_format: str, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of timestamps
+        :rtype: pyarrow.Array
+        """
+        if name in self.catalog:
+            return self._catalog_datetimes(name, num_rows, offset, date_format,
+                                           pa.timestamp("ms"))
+        seconds = self._draw(name, num_rows, offset,
+                             lambda rng, rows: rng.integers(0, DATE_RANGE_DAYS * SECONDS_PER_DAY,
+                                                            size=rows))
+        reference_second = self.reference_now.astype("datetime64[s]").astype(np.int64)
+        return pa.array((reference_second - seconds) * MS_PER_SECOND).view(pa.timestamp("ms"))
+
+    def time(self, name, num_rows, date_format="%H:%M:%S", offset=0):
+        """
+        Generates a time column.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param date_format: Format of the catalog times, defaults to '%H:%M:%S'
+        :type date_format: str, optional
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of times
+        :rtype: pyarrow.Array
+        """
+        if name in self.catalog:
+            return self._catalog_datetimes(name, num_rows, offset, date_format,
+                                           pa.time32("ms"))
+        seconds = self._draw(name, num_rows, offset,
+                             lambda rng, rows: rng.integers(0, SECONDS_PER_DAY, size=rows))
+        return pa.array((seconds * MS_PER_SECOND).astype(np.int32)).view(pa.time32("ms"))
+
+    def _draw(self, name, num_rows, offset, draw):
+        """
+        Draws the random values of a range of rows, block by block.
+
+        :param name: Name of the field
+        :type name: str
+        :param num_rows: Number of rows to draw
+        :type num_rows: int
+        :param offset: Global index of the first row, or the ascending global indices of the rows,
+            drawing the blocks they fall in up to their last row
+        :type offset: int or numpy.ndarray
+        :param draw: Function drawing the values of a number of rows from a random generator,
+            with one row per value along the first axis
+        :type draw: Callable[[numpy.random.Generator, int], numpy.ndarray]
+        :return: Values of the rows
+        :rtype: numpy.ndarray
+        """
+        if num_rows == 0:
+            return draw(self._block_rng(name, 0), 0)
+        if isinstance(offset, np.ndarray):
+            blocks = offset // BLOCK_ROWS
+            parts = []
+            for rows in np.split(offset, np.flatnonzero(np.diff(blocks)) + 1):
+                block = int(rows[0]) // BLOCK_ROWS
+                positions = rows - block * BLOCK_ROWS
+                parts.append(draw(self._block_rng(name, block), int(positions[-1]) + 1)[positions])
+            return np.concatenate(parts)
+        stop = offset + num_rows
+        parts = []
+        for block in range(offset // BLOCK_ROWS, -(-stop // BLOCK_ROWS)):
+            block_start = block * BLOCK_ROWS
+            block_rows = min(block_start + BLOCK_ROWS, stop) - block_start
+            values = draw(self._block_rng(name, block), block_rows)
+            parts.append(values[max(offset - block_start, 0):])
+        return np.concatenate(parts)
+
+    def _block_rng(self, name, block):
+        column_key = zlib.crc32(name.encode("utf-8"))
+        return np.random.default_rng(np.random.SeedSequence(self.seed,
+                                                            spawn_key=(column_key, block)))
+
+    def _string_pool(self, name, size, cardinality):
+        """
+        Get the distinct strings the rows of a field with a cardinality are drawn from. The
+        pool is drawn from its own stream of the seed, so it is the same for every range of
+        rows, and kept for the next chunks.
+        """
+        key = (name, size, cardinality)
+        if key not in self._pools:
+            cardinality = min(cardinality, len(ALPHABET) ** size)
+            column_key = zlib.crc32(name.encode("utf-8"))
+            rng = np.random.default_rng(np.random.SeedSequence(self.seed,
+                                                               spawn_key=(column_key,)))
+            codes = rng.integers(0, len(ALPHABET), size=(cardinality, size), dtype=np.uint8)
+            self._pools[key] = pc.unique(_string_array(ALPHABET[codes]))
+        return self._pools[key]
+
+    def _catalog_dictionary(self, name, num_rows, offset):
+        values = self._catalog_array(name, pa.string())
+        dictionary = pc.unique(values)
+        codes = pc.index_in(values, value_set=dictionary).cast(pa.int32())
+        return pa.DictionaryArray.from_arrays(
+            codes.take(self._catalog_indices(name, num_rows, offset)), dictionary)
+
+    def _catalog_values(self, name, num_rows, offset, arrow_type):
+        return self._catalog_array(name, arrow_type).take(
+            self._catalog_indices(name, num_rows, offset))
+
+    def _catalog_datetimes(self, name, num_rows, offset, date_format, arrow_type):
+        """
+        Parses the catalog values of a date or time field once per catalog entry, then cycles
+        the parsed values over the rows.
+        """
+        values = self._catalog_array(name, pa.string())
+        parsed = pc.strptime(values, format=date_format, unit="ms").cast(arrow_type)
+        return parsed.take(self._catalog_indices(name, num_rows, offset))
+
+    def _catalog_array(self, name, arrow_type):
+        values = self.catalog[name]
+        try:
+            return pa.array(values, type=arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array(values).cast(arrow_type)
+
+    def _catalog_indices(self, name, num_rows, offset):
+        rows = offset if isinstance(offset, np.ndarray) else np.arange(offset, offset + num_rows)
+        return pa.array(rows % len(self.catalog[name]))
+
+
+def decimal_arrow_type(decimal_precision, decimal_scale):
+    """
+    Get the Arrow type of a decimal, decimal256 when it does not fit in a decimal128.
+
+    :param decimal_precision: Precision of the decimal
+    :type decimal_precision: int
+    :param decimal_scale: Scale of the decimal
+    :type decimal_scale: int
+    :return: Arrow decimal type
+    :rtype: pyarrow.DataType
+    """
+    if decimal_precision <= MAX_DECIMAL128_PRECISION:
+        return pa.decimal128(decimal_precision, decimal_scale)
+    return pa.decimal256(decimal_precision, decimal_scale)
+
+
+def _multiply_add(words, factor, addend):
+    """
+    Computes words * factor + addend on unsigned integers stored as little-endian 64-bit words.
+
+    :param words: Words of the integers, least significant first
+    :type words: list[numpy.ndarray]
+    :param factor: Factor lower than 2 ** 63
+    :type factor: int
+    :param addend: Addends lower than 2 ** 64
+    :type addend: numpy.ndarray
+    :return: Words of the result, the carry out of the most significant word is dropped
+    :rtype: list[numpy.ndarray]
+    """
+    factor_low = np.uint64(factor & LOW_WORD_MASK)
+    factor_high = np.uint64(factor >> 32)
+    mask = np.uint64(LOW_WORD_MASK)
+    shift = np.uint64(32)
+    carry = addend
+    result = []
+    for word in words:
+        word_low = word & mask
+        word_high = word >> shift
+        low_low = word_low * factor_low
+        low_high = word_low * factor_high
+        high_low = word_high * factor_low
+        middle = (low_low >> shift) + (low_high & mask) + (high_low & mask)
+        product_low = (middle << shift) | (low_low & mask)
+        product_high = (word_high * factor_high + (low_high >> shift) + (high_low >> shift)
+                        + (middle >> shift))
+        low = product_low + carry
+        result.append(low)
+        carry = product_high + (low < product_low)
+    return result
+
+
+def _string_array(matrix):
+    """
+    Build a string array from a matrix of bytes, one row per value.
+    """
+    num_rows, size = matrix.shape
+    rows_per_chunk = max(MAX_STRING_BYTES // max(size, 1), 1)
+    chunks = []
+    for start in range(0, max(num_rows, 1), rows_per_chunk):
+        chunk = matrix[start:start + rows_per_chunk]
+        offsets = np.arange(len(chunk) + 1, dtype=np.int32) * size
+        chunks.append(pa.Array.from_buffers(pa.string(), len(chunk),
+                                            [None, pa.py_buffer(offsets),
+                                             pa.py_buffer(np.ascontiguousarray(chunk))]))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pa.chunked_array(chunks, type=pa.string())
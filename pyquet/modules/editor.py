@@ -2,18 +2,19 @@
 This module contains the TableEditor class, which is used to edit the data in a parquet file.
 """
 
-import copy
+import os
 import shutil
 import traceback
+import uuid
+from urllib.parse import quote, unquote
 
-import pandas as pd
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
-pd.set_option('display.width', None)
-pd.set_option('display.max_colwidth', None)
-pd.set_option('display.max_columns', None)
-pd.set_option('display.max_rows', None)
+from . import writers
 
 
 class FieldNotFoundException(Exception):
@@ -29,47 +30,257 @@ class FieldNotFoundException(Exception):
 class TableEditor:
     """
     A class used to edit the data in a parquet file.
+
+    The dataset is opened lazily as a pyarrow dataset: creating an editor reads nothing, the
+    read methods only load the columns and partitions they are asked for, and the updates
+    rewrite the dataset file by file.
     """
-    def __init__(self, path, schema, partitions):
+    def __init__(self, path, schema, partitions, parquet_options=None):
+        """
+        Initialize the TableEditor with the dataset path, its schema and its partitions.
+
+        :param path: Path of the parquet dataset
+        :type path: str
+        :param schema: Arrow schema of the dataset
+        :type schema: pyarrow.Schema
+        :param partitions: List of partition columns, None if the dataset is not partitioned
+        :type partitions: list
+        :param parquet_options: Parquet writer options of the rewritten files, see
+            writers.parquet_write_kwargs, defaults to None
+        :type parquet_options: dict, optional
+        """
         self.path = path
-        self.df = pd.read_parquet(self.path)
         self.schema = schema
-        self.tmp_path = path + "_tmp"
-        self.partitions = partitions
+        self.partitions = list(partitions or [])
+        self.parquet_options = parquet_options
+        self.rewritten = []
+        self._dataset = None
+        self._df = None
+
+    @property
+    def dataset(self):
+        """
+        Parquet dataset of the table, with the types of the schema for the partition columns.
+        The files are discovered on first use and after every update.
+        """
+        if self._dataset is None:
+            partitioning = ds.partitioning(pa.schema([self.schema.field(partition)
+                                                      for partition in self.partitions]),
+                                           flavor="hive")
+            self._dataset = ds.dataset(self.path, format="parquet", partitioning=partitioning)
+        return self._dataset
+
+    @property
+    def df(self):
+        """
+        DataFrame with all the data of the table, read on first use and after every update.
+        Prefer read or iter_batches with the needed columns on large tables.
+        """
+        if self._df is None:
+            self._df = self.read().to_pandas()
+        return self._df
+
+    def read(self, columns=None, filter_expression=None):
+        """
+        Read the given columns of the rows matching a filter, only reading the files of the
+        partitions and the row groups that can match it.
+
+        :param columns: Names of the columns to read, defaults to every column
+        :type columns: list, optional
+        :param filter_expression: Filter of the rows to read, defaults to every row
+        :type filter_expression: pyarrow.compute.Expression, optional
+        :return: Table of the rows read
+        :rtype: pyarrow.Table
+        """
+        return self.dataset.to_table(columns=columns, filter=filter_expression)
 
-    def backup_table(self):
+    def iter_batches(self, columns=None, filter_expression=None, batch_rows=None):
         """
-        Backup the table in a temporary directory.
+        Stream the given columns of the rows matching a filter in record batches, file by file,
+        so that memory usage does not depend on the size of the table.
+
+        :param columns: Names of the columns to read, defaults to every column
+        :type columns: list, optional
+        :param filter_expression: Filter of the rows to read, defaults to every row
+        :type filter_expression: pyarrow.compute.Expression, optional
+        :param batch_rows: Maximum rows per record batch, defaults to the pyarrow default
+        :type batch_rows: int, optional
+        :return: Generator of record batches
+        :rtype: Iterator[pyarrow.RecordBatch]
+        """
+        kwargs = {"batch_size": batch_rows} if batch_rows else {}
+        yield from self.dataset.to_batches(columns=columns, filter=filter_expression,
+                                           batch_readahead=0, fragment_readahead=0, **kwargs)
+
+    def set_constants(self, map_dict, partition_filter=None):
         """
-        shutil.copytree(self.path, self.tmp_path)
+        Set the constants in the table, only rewriting the files of the matching partitions.
+
+        Every rewritten file is first written to a staging directory next to the dataset, so an
+        error while writing leaves the dataset untouched and there is no backup of the dataset.
+        Once all of them are written, they are renamed over the original files one by one: each
+        file is replaced atomically, but not the whole update, see writers.replace_files. Setting a
+        partition column moves the files to the directory of the new partition value.
+
+        The editor is returned instead of the updated DataFrame, which is only read again on
+        first use of df, and the paths of the rewritten files are kept in rewritten.
+
+        :param map_dict: Values of the columns to set
+        :type map_dict: dict
+        :param partition_filter: Values of partition columns, a value or a list of values, the
+            files of other partitions are not rewritten, defaults to every partition
+        :type partition_filter: dict, optional
+        :return: The editor
+        :rtype: TableEditor
+        """
+        staging_path = writers.staging_path(self.path)
+        self.rewritten = []
+        try:
+            for column in map_dict:
+                if column not in self.schema.names:
+                    raise FieldNotFoundException(column)
+            constants = {column: pa.array([value]).cast(self.schema.field(column).type)
+                         for column, value in map_dict.items()}
+            moved = {column: constant.cast(pa.string())[0].as_py()
+                     for column, constant in constants.items() if column in self.partitions}
+            replacements = []
+            for directory, values, name in self._partition_files(partition_filter):
+                source = os.path.join(self.path, directory, name)
+                new_directory = _partition_directory(self.partitions, {**values, **moved})
+                if new_directory != directory:
+                    name = f"{uuid.uuid4().hex}-{name}"
+                staged = os.path.join(staging_path, new_directory, name)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                table = pq.read_table(source, partitioning=None)
+                for column, constant in constants.items():
+                    if column in table.column_names:
+                        table = table.set_column(table.column_names.index(column),
+                                                 self.schema.field(column),
+                                                 constant.take(np.zeros(table.num_rows,
+                                                                        dtype=np.int32)))
+                writers.write_parquet_file(table, staged, self.parquet_options)
+                replacements.append((source, staged, os.path.join(self.path, new_directory, name)))
+            self._replace_files(replacements)
+        except FieldNotFoundException:
+            traceback.print_exc()
+        except Exception as e: # pylint: disable=broad-except
+            print("An error occurred:", e)
+            traceback.print_exc()
+        finally:
+            shutil.rmtree(staging_path, ignore_errors=True)
+        return self
 
-    def set_constants(self, map_dict):
+    def update(self, map_dict, filter_expression=None):
         """
-        Set the constants in the table.
-        :param map_dict:
-        :return: Updated DataFrame
+        Set columns to a value in the rows matching a filter, only rewriting the files that
+        have matching rows.
+
+        The dataset is scanned with pyarrow.dataset, so the partitions that cannot match the
+        filter are pruned from their directory names and the files whose row group statistics
+        rule the filter out are skipped without reading their data. In the other files, the
+        values of the matching rows are replaced with pyarrow.compute.if_else. The rewritten
+        files are staged and renamed as in set_constants, each file being replaced atomically
+        but not the whole update.
+
+        :param map_dict: Values of the columns to set, which cannot be partition columns
+        :type map_dict: dict
+        :param filter_expression: Filter of the rows to update, with values of the column types,
+            e.g. (pc.field('cutoff_date') == date(2025, 1, 31)) & pc.field('country').isin(['ES']),
+            defaults to every row
+        :type filter_expression: pyarrow.compute.Expression, optional
+        :return: Paths of the rewritten files
+        :rtype: list
         """
-        self.backup_table()
-        df = copy.deepcopy(self.df)
+        staging_path = writers.staging_path(self.path)
+        self.rewritten = []
         try:
-            for column, value in map_dict.items():
-                if column not in self.df.columns:
+            for column in map_dict:
+                if column not in self.schema.names:
                     raise FieldNotFoundException(column)
-                df[column] = value
-            table = pa.Table.from_pandas(df)
-            table = table.cast(self.schema)
-            shutil.rmtree(self.path)
-            pq.write_to_dataset(table, self.path, partition_cols=self.partitions)
-            self.df = df
+                if column in self.partitions:
+                    raise ValueError(f"Partition column '{column}' can only be set with "
+                                     "set_constants.")
+            dataset = self.dataset
+            if filter_expression is None:
+                filter_expression = pc.scalar(True)
+            replacements = []
+            for fragment in dataset.get_fragments(filter=filter_expression):
+                if fragment.subset(filter_expression, schema=dataset.schema).num_row_groups == 0:
+                    continue
+                table = fragment.to_table(schema=dataset.schema)
+                mask = pc.fill_null(ds.dataset(table).to_table(
+                    columns={"mask": filter_expression}).column("mask"), False)
+                if not pc.any(mask).as_py():
+                    continue
+                for column, value in map_dict.items():
+                    index = table.column_names.index(column)
+                    constant = pa.array([value]).cast(table.schema.field(column).type)[0]
+                    table = table.set_column(index, table.schema.field(column),
+                                             pc.if_else(mask, constant, table.column(index)))
+                relative_path = os.path.relpath(fragment.path, self.path)
+                staged = os.path.join(staging_path, relative_path)
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                writers.write_parquet_file(table.select(fragment.physical_schema.names), staged,
+                                           self.parquet_options)
+                replacements.append((fragment.path, staged, fragment.path))
+            self._replace_files(replacements)
         except FieldNotFoundException:
-            shutil.rmtree(self.path, ignore_errors=True)
-            shutil.copytree(self.tmp_path, self.path)
             traceback.print_exc()
         except Exception as e: # pylint: disable=broad-except
-            shutil.rmtree(self.path, ignore_errors=True)
-            shutil.copytree(self.tmp_path, self.path)
             print("An error occurred:", e)
             traceback.print_exc()
         finally:
-            shutil.rmtree(self.tmp_path)
-        return self.df
+            shutil.rmtree(staging_path, ignore_errors=True)
+        return self.rewritten
+
+    def _replace_files(self, replacements):
+        """
+        Rename the staged files over the files they replace and keep their paths in rewritten,
+        see writers.replace_files.
+
+        :param replacements: Path of the replaced file, of the staged file and of its target
+        :type replacements: list
+        """
+        self._dataset = None
+        self._df = None
+        writers.replace_files(replacements, self.path, self.rewritten)
+
+    def _partition_files(self, partition_filter=None):
+        """
+        Get the data files of the partitions matching the filter.
+
+        :param partition_filter: Values of partition columns, defaults to every partition
+        :type partition_filter: dict, optional
+        :return: Relative directory, partition values and name of every file
+        :rtype: list
+        """
+        allowed = {}
+        for column, values in (partition_filter or {}).items():
+            if column not in self.partitions:
+                raise FieldNotFoundException(column)
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            allowed[column] = {pa.array([value]).cast(self.schema.field(column).type)
+                               .cast(pa.string())[0].as_py() for value in values}
+        files = []
+        for root, _, names in os.walk(self.path):
+            directory = os.path.relpath(root, self.path).replace(os.sep, "/")
+            directory = "" if directory == "." else directory
+            segments = directory.split("/") if directory else []
+            values = dict(segment.split("=", 1) for segment in segments if "=" in segment)
+            values = {column: unquote(value) for column, value in values.items()}
+            if list(values) != list(self.partitions) or len(segments) != len(values):
+                continue
+            if any(values[column] not in allowed[column] for column in allowed):
+                continue
+            files.extend((directory, values, name) for name in sorted(names)
+                         if not name.startswith((".", "_")))
+        return files
+
+
+def _partition_directory(partitions, values):
+    """
+    Format the hive directory of the partition values, relative to the dataset, empty without
+    partitions.
+    """
+    return "/".join(f"{column}={quote(values[column], safe='')}" for column in partitions)
+
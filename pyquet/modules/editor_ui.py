@@ -7,17 +7,25 @@ import os.path
 import shutil
 import tkinter as tk
 import traceback
-from tkinter import filedialog
+from tkinter import filedialog, simpledialog
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 from pandastable import Table, TableModel
 
+from .editor import FieldNotFoundException
+from .pager import DatasetPager
+
 
 class CustomTable(Table):  # pylint: disable=too-many-ancestors
     """
     A custom table class for displaying and editing parquet files.
+
+    The rows are read in pages with a DatasetPager: the first page is shown when a dataset is
+    loaded, and the next one is appended whenever the table is scrolled to the last loaded rows.
+    Every row keeps its position in the dataset as its index label, so that saving can put
+    sorted rows back in place and only rewrite the files of the edited rows.
     """
 
     def __init__(self, parent=None, **kwargs):
@@ -25,53 +33,123 @@ class CustomTable(Table):  # pylint: disable=too-many-ancestors
         self.partitions = []
         self.file_path = None
         self.schema = None
+        self.pager = None
+        self.loaded_pages = 0
 
     def load_csv(self):
         """
         Load a parquet file and display it in the table.
+
+        Before loading, the columns and the partition values to read can be selected, e.g.
+        'field_1,field_2' and 'cutoff_date=2025-01-31,2025-02-28;country=ES', blank for all.
         """
         self.file_path = filedialog.askdirectory()
         if self.file_path:
             try:
-                df = pd.read_parquet(self.file_path, dtype_backend="pyarrow")
-                self.schema = pa.Schema.from_pandas(df)
-                self.partitions = [
-                    field.name for field in self.schema if isinstance(field.type, pa.DictionaryType)
-                ]
-                transformed_fields = [
+                columns = simpledialog.askstring("Columns",
+                                                 "Comma separated columns, blank for all:")
+                partition_filter = simpledialog.askstring(
+                    "Partitions", "Partition values, e.g. cutoff_date=2025-01-31;country=ES,PE, "
+                                  "blank for all:")
+                self.pager = DatasetPager(self.file_path,
+                                          [column.strip() for column in columns.split(",")
+                                           if column.strip()] if columns else None,
+                                          _parse_partition_filter(partition_filter))
+                self.partitions = [partition for partition in self.pager.partitions
+                                   if partition in self.pager.columns]
+                self.schema = pa.schema([
                     pa.field(field.name, pa.string())
                     if field.type == pa.dictionary(pa.int32(), pa.string()) else field
-                    for field in self.schema
-                ]
-                self.schema = pa.schema(transformed_fields)
-                df_string = pd.read_parquet(self.file_path)
-                self.updateModel(TableModel(df_string))
-            except pd.errors.ParserError:
+                    for field in (self.pager.schema.field(column) for column in self.pager.columns)
+                ])
+                self.loaded_pages = 0
+                self.updateModel(TableModel(self._next_page()))
+            except pa.ArrowInvalid:
                 print("Invalid file.")
+            except FieldNotFoundException as e:
+                print("Not a partition column:", e.field)
             except Exception as e:  # pylint: disable=broad-except
                 print("An error occurred:", e)
                 print(traceback.print_exc())
 
+    def redrawVisible(self, event=None, callback=None):  # pylint: disable=invalid-name
+        """
+        Redraw the visible rows, appending the next page when the last loaded rows are visible.
+        """
+        super().redrawVisible(event, callback)
+        visible_rows = getattr(self, "visiblerows", None)
+        if (self.pager and self.loaded_pages < self.pager.num_pages and visible_rows
+                and max(visible_rows) >= len(self.model.df) - 1):
+            self.model.df = pd.concat([self.model.df, self._next_page()])
+            super().redrawVisible(event, callback)
+
+    def load_all_pages(self):
+        """
+        Load the pages that are not loaded yet.
+        """
+        if self.pager and self.loaded_pages < self.pager.num_pages:
+            self.model.df = pd.concat([self.model.df]
+                                      + [self._next_page()
+                                         for _ in range(self.loaded_pages, self.pager.num_pages)])
+
+    def _next_page(self):
+        page = self.pager.page_dataframe(self.loaded_pages, self.schema)
+        self.loaded_pages += 1
+        return page
+
     def save_csv(self):
         """
-        Save the edited table to a parquet file.
+        Save the edited rows into the loaded dataset, only rewriting the files they were read
+        from. The edited rows are found by comparing the loaded rows with the dataset, so edits
+        of any kind are saved, but nothing is saved when a partition column was edited, as the
+        rows would have to move to another partition. When rows were added or
+        deleted, the whole table is saved to a chosen directory instead, loading the remaining
+        pages first, which is refused when only some columns or partitions were loaded.
         """
-        if self.file_path:
-            file_path = filedialog.askdirectory()
-        else:
-            file_path = filedialog.askdirectory()
+        if self.pager and self._rows_unchanged():
+            try:
+                rewritten = self.pager.save_dataframe(self.model.df, self.schema)
+                print("Saved", len(rewritten), "edited files in:", self.file_path)
+            except ValueError as e:
+                print("Nothing was saved:", e)
+            except Exception as e:  # pylint: disable=broad-except
+                print("An error occurred:", e)
+                print(traceback.print_exc())
+            return
+        if self.pager and not self.pager.complete:
+            print("Rows were added or deleted in a selection of columns or partitions, which "
+                  "cannot be saved as a whole table. Load the table without a selection.")
+            return
+        file_path = filedialog.askdirectory()
         if file_path:
             try:
+                self.load_all_pages()
                 if os.path.exists(file_path):
                     shutil.rmtree(file_path)
                 df = self.model.df
-                pa_table = pa.Table.from_pandas(df)
+                pa_table = pa.Table.from_pandas(df, preserve_index=False)
                 pa_table = pa_table.cast(self.schema)
                 pq.write_to_dataset(pa_table, file_path, partition_cols=self.partitions)
             except Exception as e:  # pylint: disable=broad-except
                 print("An error occurred:", e)
                 print(traceback.print_exc())
 
+    def _rows_unchanged(self):
+        loaded_rows = min(self.loaded_pages * self.pager.page_rows, self.pager.num_rows)
+        return list(self.model.df.index.sort_values()) == list(range(loaded_rows))
+
+
+def _parse_partition_filter(text):
+    """
+    Parse partition values written as column=value,value;column=value.
+    """
+    partition_filter = {}
+    for condition in (text or "").split(";"):
+        if "=" in condition:
+            column, values = condition.split("=", 1)
+            partition_filter[column.strip()] = [value.strip() for value in values.split(",")]
+    return partition_filter or None
+
 
 class CustomToolbar(tk.Frame):
     """
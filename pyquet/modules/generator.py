@@ -3,17 +3,22 @@ This module contains the DataGenerator class, which is used to generate data in
 """
 
 import os.path
-import random
-import re
-import string
-from datetime import datetime, timedelta
-from decimal import Decimal
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 
-import pandas as pd
+import numpy as np
 import pyarrow as pa
-import pyarrow.parquet as pq
 
-from . import common
+from .. import __version__
+from . import common, writers
+from .cache import DatasetCache
+from .columns import ColumnEngine
+from .partitions import existing_partitions, partition_row_indices, plan_partitions
+from .plan import SchemaPlan, load_plan
+from .stats import GenerationStats, peak_rss, tree_size
+from .writers import WRITERS, register_writer  # pylint: disable=unused-import
 
 
 class DataGenerator:
@@ -21,7 +26,20 @@ class DataGenerator:
     Class for generating data.
     """
 
-    def __init__(self, catalog_path=None, num_rows=10, limit_rows=True):
+    def __init__(self,
+                 catalog_path=None,
+                 num_rows=10,
+                 limit_rows=True,
+                 chunk_rows=None,
+                 workers=1,
+                 seed=None,
+                 reference_now=None,
+                 parquet_options=None,
+                 partition_rows=None,
+                 partition_skew=0,
+                 cache_dir=None,
+                 cache_max_bytes=None,
+                 csv_options=None):
         """
         Initialize the DataGenerator with the catalog path and number of rows.
 
@@ -31,6 +49,34 @@ class DataGenerator:
         :type num_rows: int, optional
         :param limit_rows: Whether to limit rows based on catalog, defaults to True
         :type limit_rows: bool, optional
+        :param chunk_rows: Rows per record batch when streaming the output, defaults to None
+        :type chunk_rows: int, optional
+        :param workers: Number of processes generating the rows, defaults to 1
+        :type workers: int, optional
+        :param seed: Seed of the random values, defaults to a random seed
+        :type seed: int, optional
+        :param reference_now: Date the random dates are counted back from, defaults to a fixed
+            date when a seed is given and to the start of the current day otherwise
+        :type reference_now: datetime, optional
+        :param parquet_options: Parquet writer options: row_group_size, max_rows_per_file,
+            compression, compression_level, use_dictionary, data_page_size, write_statistics
+            and write_page_index, defaults to None
+        :type parquet_options: dict, optional
+        :param partition_rows: Rows of each partition, a number for every partition or a dict
+            from the partition values to their rows, defaults to splitting num_rows
+        :type partition_rows: int or dict, optional
+        :param partition_skew: Skew of num_rows split between partitions, the k-th partition
+            getting a share proportional to 1 / (k + 1) ** partition_skew, defaults to 0
+        :type partition_skew: float, optional
+        :param cache_dir: Directory of the dataset cache, where the generated data is stored and
+            reused by any later generation with the same inputs, defaults to no cache
+        :type cache_dir: str, optional
+        :param cache_max_bytes: Maximum size of the dataset cache, the least recently used
+            datasets are evicted, defaults to no limit
+        :type cache_max_bytes: int, optional
+        :param csv_options: CSV writer options: compression (gzip, bz2, zstd or lz4), delimiter
+            and parts, the number of files the rows are split in, defaults to None
+        :type csv_options: dict, optional
         """
         if catalog_path:
             self.catalog = common.read_json(catalog_path)
@@ -41,19 +87,61 @@ class DataGenerator:
         else:
             self.catalog = {}
             self.num_rows = num_rows
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.parquet_options = parquet_options
+        self.csv_options = csv_options
+        self.partition_rows = partition_rows
+        self.partition_skew = partition_skew
+        self.seed = seed
+        self.cache = DatasetCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.last_stats = None
+        self.engine = ColumnEngine(self.catalog, seed, reference_now)
 
     def generate_data(self,
                       schema_path,
                       output_type,
                       partitions=None,
                       destination_path=None,
-                      destination_dir=None):
+                      destination_dir=None,
+                      append=False,
+                      partition_values=None,
+                      stats_callback=None):
         """
         Generates data based on the schema and saves it to the specified location.
 
-        :param schema_path: Path to the schema file
-        :type schema_path: str
-        :param output_type: Type of output (e.g., 'csv', 'parquet')
+        The columns are generated as Arrow arrays of the target schema types and written
+        without any pandas conversion or cast. When chunk_rows is set, the rows are generated
+        and written in record batches of chunk_rows rows, so memory usage does not depend on the
+        number of rows. When workers is greater than 1, the rows are split in shards generated
+        by a pool of processes.
+
+        Besides csv, the output types are the dataset writers registered in WRITERS:
+        parquet, ipc, feather, orc and ndjson. The options of a writer are read from the
+        <output_type>_options attribute of the generator, e.g. parquet_options.
+
+        When every partition column of a dataset output has catalog values, the rows of each
+        combination of partition values are planned up front and written straight into its
+        partition directory, see partitions.plan_partitions. Otherwise the rows are split in
+        partitions as they are written.
+
+        In append mode, the partitions that already have files in the target dataset are
+        skipped and the new partitions are written alongside them, leaving the existing files
+        untouched. The partitions keep the rows they would get in a full generation, and the
+        partitions of partition_values get rows of their own, see partitions.plan_partitions,
+        so a partition appended every day does not repeat the values of the others.
+
+        When a cache directory is set, a dataset generated before from the same schema,
+        catalog, number of rows, seed, reference date and writer settings is linked into the
+        target path instead of being generated again.
+
+        The time spent generating each column, assembling the tables and writing them, the
+        bytes and files written and the peak memory are kept in last_stats and passed to
+        stats_callback.
+
+        :param schema_path: Path to the schema file or compiled schema
+        :type schema_path: str or SchemaPlan
+        :param output_type: Type of output (e.g., 'csv', 'parquet', 'ipc', 'orc', 'ndjson')
         :type output_type: str
         :param partitions: List of partition columns, defaults to None
         :type partitions: list, optional
@@ -61,49 +149,28 @@ class DataGenerator:
         :type destination_path: str, optional
         :param destination_dir: Directory to save the generated data, defaults to None
         :type destination_dir: str, optional
+        :param append: Whether to only add the missing partitions to an existing dataset,
+            defaults to False
+        :type append: bool, optional
+        :param partition_values: Values of partition columns to generate instead of their
+            catalog values, e.g. {'gf_cutoff_date': ['2025-01-31']}, defaults to None
+        :type partition_values: dict, optional
+        :param stats_callback: Function called with the GenerationStats of the generation,
+            defaults to None
+        :type stats_callback: callable, optional
         :return: Tuple of target path and target schema
         :rtype: tuple
         """
-        data = {}
-        field_format = []
-        schema = common.read_json(schema_path)
-        for field in schema["fields"]:
-            name = field["name"]
-            data_type = field["logicalFormat"]
-            if data_type.startswith("ALPHANUMERIC"):
-                match = re.match(r'ALPHANUMERIC\(([0-9]*)\)', data_type)
-                string_len = match.group(1)
-                data[name] = self.generate_alphanumeric(name, int(string_len))
-                field_format.append((field["name"], pa.string()))
-            elif data_type.startswith("NUMERIC SHORT"):
-                data[name] = self.generate_int(name)
-                field_format.append((field["name"], pa.int64()))
-            elif data_type.startswith("DECIMAL"):
-                match = re.match(r'DECIMAL\(([0-9]*),?([0-9]*)\)', data_type)
-                decimal_precision = int(match.group(1))
-                decimal_scale = match.group(2)
-                decimal_scale = int(decimal_scale) if decimal_scale != "" else 0
-                data[name] = self.generate_decimal(name, decimal_precision, decimal_scale)
-                field_format.append((field["name"],
-                                     pa.decimal128(decimal_precision, decimal_scale)))
-            elif data_type.startswith("DATE"):
-                data[name] = self.generate_date(name)
-                field_format.append((field["name"], pa.date32()))
-            elif data_type.startswith("TIMESTAMP"):
-                data[name] = self.generate_timestamp(name)
-                field_format.append((field["name"], pa.timestamp("ms")))
-            elif data_type.startswith("TIME"):
-                data[name] = self.generate_time(name)
-                field_format.append((field["name"], pa.time32("ms")))
-            else:
-                print("Unrecognized logicalFormat:", data_type)
+        start_time = time.perf_counter()
+        plan = _get_plan(schema_path)
+        target_schema = plan.arrow_schema
 
         if destination_path:
             target_path = destination_path
         elif destination_dir:
-            target_path = os.path.join(destination_dir, schema["name"])
+            target_path = os.path.join(destination_dir, plan.name)
         else:
-            target_path = schema["physicalPath"]
+            target_path = plan.physical_path
 
         target_dir = os.path.dirname(target_path)
         if target_dir and not os.path.exists(target_dir):
@@ -111,23 +178,332 @@ class DataGenerator:
 
         print("Writing data in:", target_path)
 
-        if os.path.isfile(target_path):
+        if os.path.isfile(target_path) and not append:
             os.remove(target_path)
-        df = pd.DataFrame(data)
-        target_schema = pa.schema(field_format)
-        if output_type == "csv":
-            if not target_path.endswith(".csv"):
-                target_path += ".csv"
-            df.to_csv(target_path, index=False)
-        elif output_type == "parquet":
-            table = pa.Table.from_pandas(df)
-            table = table.cast(target_schema)
-            pq.write_to_dataset(table, target_path, partition_cols=partitions)
+        if output_type == "csv" and self._csv_option("parts", 1) == 1:
+            extension = writers.csv_extension(self._csv_option("compression"))
+            if target_path.endswith(".csv"):
+                target_path = target_path[:-len(".csv")]
+            target_path += extension
+        stats = GenerationStats()
+        files_before, bytes_before = tree_size(target_path)
+        cache_key = None
+        valid_output = output_type == "csv" or output_type in WRITERS
+        if self.cache and not append and valid_output:
+            cache_key = self._cache_key(plan, output_type, partitions, partition_values)
+            stats.cached = self.cache.fetch(cache_key, target_path)
+            if stats.cached or os.path.exists(target_path):
+                cache_key = None
+
+        planned = None
+        if output_type in WRITERS and partitions and not stats.cached:
+            skip = existing_partitions(target_path, partitions) if append else None
+            planned = plan_partitions(plan, self.engine, partitions, self.num_rows,
+                                      self.partition_rows, self.partition_skew,
+                                      partition_values, skip)
+        if stats.cached:
+            print("Reusing cached data:", target_path)
+        elif not valid_output:
+            print("Unrecognized output type:", output_type, "Valid options are:",
+                  ", ".join(["csv"] + list(WRITERS)))
+        elif append and output_type == "csv":
+            print("Append mode is only supported for dataset outputs:",
+                  ", ".join(WRITERS))
+        elif append and partitions and planned is None:
+            print("Append mode needs catalog or given values for the partition columns:",
+                  partitions)
+        elif planned is not None:
+            stats.merge(self._write_partitions(plan, output_type, target_path, partitions,
+                                               planned))
+        elif output_type == "csv" and self._csv_option("parts", 1) > 1:
+            stats.merge(self._write_shards(plan, output_type, target_path, partitions,
+                                           self._csv_option("parts")))
+        elif self.workers > 1:
+            stats.merge(self._write_shards(plan, output_type, target_path, partitions,
+                                           self.workers))
         else:
-            print("Unrecognized output type:", output_type, "Valid options are: csv, parquet")
+            stats.merge(self._write_rows(plan, output_type, target_path, partitions, 0,
+                                         self.num_rows))
+        if cache_key and os.path.exists(target_path):
+            self.cache.store(cache_key, target_path)
+
+        files_after, bytes_after = tree_size(target_path)
+        stats.files_written = files_after - files_before
+        stats.bytes_written = bytes_after - bytes_before
+        stats.total_seconds = time.perf_counter() - start_time
+        stats.peak_rss_bytes = peak_rss()
+        self.last_stats = stats
+        if stats_callback:
+            stats_callback(stats)
         return target_path, target_schema
 
-    def generate_alphanumeric(self, name, size=1):
+    def generate_dataframe(self, schema_path):
+        """
+        Generates data based on the schema and returns it as a pandas DataFrame.
+
+        :param schema_path: Path to the schema file or compiled schema
+        :type schema_path: str or SchemaPlan
+        :return: DataFrame with the generated data
+        :rtype: pandas.DataFrame
+        """
+        return self.to_table(schema_path).to_pandas()
+
+    def iter_batches(self, schema_path, batch_rows=None):
+        """
+        Generates data based on the schema and yields it as Arrow record batches, without
+        writing anything to disk. Only one batch is held in memory at a time, and with the same
+        seed the rows are the rows written by generate_data, grouped by partition in a
+        partitioned output, unless partition_rows or partition_skew set the rows of the
+        partitions.
+
+        :param schema_path: Path to the schema file or compiled schema
+        :type schema_path: str or SchemaPlan
+        :param batch_rows: Rows per record batch, defaults to chunk_rows, or every row in a
+            single batch
+        :type batch_rows: int, optional
+        :return: Generator of record batches of the target schema
+        :rtype: Iterator[pyarrow.RecordBatch]
+        """
+        plan = _get_plan(schema_path)
+        yield from self._generate_batches(plan, 0, self.num_rows, batch_rows=batch_rows)
+
+    def to_table(self, schema_path):
+        """
+        Generates data based on the schema and returns it as an Arrow table, without writing
+        anything to disk.
+
+        :param schema_path: Path to the schema file or compiled schema
+        :type schema_path: str or SchemaPlan
+        :return: Table of the target schema with the generated data
+        :rtype: pyarrow.Table
+        """
+        plan = _get_plan(schema_path)
+        return plan.generate(self.engine, self.num_rows)
+
+    def _cache_key(self, plan, output_type, partitions, partition_values):
+        """
+        Computes the cache key of a dataset from every input its content depends on.
+
+        :return: Cache key
+        :rtype: str
+        """
+        partition_rows = self.partition_rows
+        if isinstance(partition_rows, dict):
+            partition_rows = {str(key): rows for key, rows in partition_rows.items()}
+        return DatasetCache.key(version=__version__,
+                                schema=plan.schema,
+                                catalog=self.catalog,
+                                num_rows=self.num_rows,
+                                seed=self.seed,
+                                reference_now=self.engine.reference_now,
+                                output_type=output_type,
+                                partitions=partitions,
+                                partition_values=partition_values,
+                                partition_rows=partition_rows,
+                                partition_skew=self.partition_skew,
+                                chunk_rows=self.chunk_rows,
+                                workers=self.workers,
+                                output_options=getattr(self, f"{output_type}_options", None))
+
+    def _write_shards(self, plan, output_type, target_path, partitions, num_shards):
+        """
+        Generates the rows in shards of consecutive rows, by a pool of processes when workers is
+        greater than 1.
+
+        Parquet shards write their own part files in the target dataset, named after the shard
+        so that the files sort in row order. CSV shards write a part file each, which are kept
+        in the target directory, with a header each, when csv_options has several parts, and
+        are otherwise concatenated in order into the target file.
+
+        :param plan: Compiled schema
+        :type plan: SchemaPlan
+        :param output_type: Type of output (e.g., 'csv', 'parquet')
+        :type output_type: str
+        :param target_path: Path to save the generated data
+        :type target_path: str
+        :param partitions: List of partition columns
+        :type partitions: list
+        :param num_shards: Number of shards
+        :type num_shards: int
+        :return: Stats of the shards
+        :rtype: GenerationStats
+        """
+        stats = GenerationStats()
+        shard_rows = max(-(-self.num_rows // num_shards), 1)
+        shards = [(start, min(start + shard_rows, self.num_rows))
+                  for start in range(0, max(self.num_rows, 1), shard_rows)]
+        csv_parts = output_type == "csv" and self._csv_option("parts", 1) > 1
+        extension = writers.csv_extension(self._csv_option("compression"))
+        token = uuid.uuid4().hex
+        tasks = []
+        part_paths = []
+        for shard, (start, stop) in enumerate(shards):
+            shard_path = target_path
+            if csv_parts:
+                shard_path = os.path.join(target_path, f"part-{shard:05d}{extension}")
+            elif output_type == "csv":
+                shard_path = f"{target_path}.part-{shard:05d}"
+                part_paths.append(shard_path)
+            tasks.append((plan, output_type, shard_path, partitions, start, stop,
+                          self._basename_template(output_type, token, shard),
+                          csv_parts or start == 0))
+        if csv_parts:
+            os.makedirs(target_path, exist_ok=True)
+            for name in os.listdir(target_path):
+                if name.startswith("part-"):
+                    os.remove(os.path.join(target_path, name))
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_write_shard, self, *task) for task in tasks]
+                for future in futures:
+                    stats.merge(future.result())
+        else:
+            for task in tasks:
+                stats.merge(self._write_rows(*task))
+        if part_paths:
+            if os.path.exists(target_path):
+                os.remove(target_path)
+            with open(target_path, "wb") as target_file:
+                for part_path in part_paths:
+                    with open(part_path, "rb") as part_file:
+                        shutil.copyfileobj(part_file, target_file)
+                    os.remove(part_path)
+        return stats
+
+    @staticmethod
+    def _basename_template(output_type, token, shard):
+        if output_type == "csv":
+            return None
+        return f"{token}-{shard:05d}-{{i}}{WRITERS[output_type][1]}"
+
+    def _csv_option(self, name, default=None):
+        return (self.csv_options or {}).get(name) or default
+
+    def _write_partitions(self, plan, output_type, target_path, partitions, planned):
+        """
+        Generates the planned rows of each partition and writes them in its directory, without
+        the partition columns. The rows are split in shards of consecutive rows of a partition,
+        generated by a pool of processes when workers is greater than 1.
+
+        :param plan: Compiled schema
+        :type plan: SchemaPlan
+        :param target_path: Path of the dataset directory
+        :type target_path: str
+        :param partitions: List of partition columns
+        :type partitions: list
+        :param planned: Directory, positions of the rows in the catalog cycle, length of the cycle
+            and number of rows of each partition, see partitions.plan_partitions
+        :type planned: list
+        :return: Stats of the shards
+        :rtype: GenerationStats
+        """
+        stats = GenerationStats()
+        if not planned:
+            print("No partitions to generate in:", target_path)
+            return stats
+        data_plan = plan.drop(partitions)
+        total_rows = sum(count for *_, count in planned)
+        shard_rows = max(-(-total_rows // self.workers), 1)
+        token = uuid.uuid4().hex
+        tasks = []
+        for directory, positions, stride, count in planned:
+            for shard, shard_start in enumerate(range(0, count, shard_rows)):
+                tasks.append((data_plan, output_type, os.path.join(target_path, directory), None,
+                              shard_start, min(shard_start + shard_rows, count),
+                              self._basename_template(output_type, token, shard), None,
+                              (positions, stride)))
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_write_shard, self, *task) for task in tasks]
+                for future in futures:
+                    stats.merge(future.result())
+        else:
+            for task in tasks:
+                stats.merge(self._write_rows(*task))
+        return stats
+
+    def _write_rows(self,
+                    plan,
+                    output_type,
+                    target_path,
+                    partitions,
+                    start,
+                    stop,
+                    basename_template=None,
+                    header=None,
+                    cycle=None):
+        """
+        Generates the rows from start to stop and streams them to the target path.
+
+        :param plan: Compiled schema
+        :type plan: SchemaPlan
+        :param output_type: Type of output (e.g., 'csv', 'parquet')
+        :type output_type: str
+        :param target_path: Path to save the generated data
+        :type target_path: str
+        :param partitions: List of partition columns
+        :type partitions: list
+        :param start: Global index of the first row
+        :type start: int
+        :param stop: Global index after the last row
+        :type stop: int
+        :param basename_template: Template of the dataset file names, defaults to None
+        :type basename_template: str, optional
+        :param header: Whether to write the csv header, defaults to start == 0
+        :type header: bool, optional
+        :param cycle: Positions of the rows of a partition in the catalog cycle and length of the
+            cycle, start and stop then index the rows of the partition, see
+            partitions.partition_row_indices, defaults to None
+        :type cycle: tuple, optional
+        :return: Stats of the rows
+        :rtype: GenerationStats
+        """
+        stats = GenerationStats()
+        start_time = time.perf_counter()
+        batches = self._generate_batches(plan, start, stop, stats, cycle=cycle)
+        if output_type == "csv":
+            writers.write_csv(batches, plan.arrow_schema, target_path,
+                              header=start == 0 if header is None else header,
+                              compression=self._csv_option("compression"),
+                              delimiter=self._csv_option("delimiter", ","))
+        else:
+            write, _ = WRITERS[output_type]
+            write(batches, plan.arrow_schema, target_path, partitions, basename_template,
+                  getattr(self, f"{output_type}_options", None))
+        stats.stream_seconds = time.perf_counter() - start_time
+        return stats
+
+    def _generate_batches(self, plan, start, stop, stats=None, batch_rows=None, cycle=None):
+        """
+        Generates the rows from start to stop in record batches of at most batch_rows rows.
+
+        :param plan: Compiled schema
+        :type plan: SchemaPlan
+        :param start: Global index of the first row
+        :type start: int
+        :param stop: Global index after the last row
+        :type stop: int
+        :param stats: Stats timing the generation, defaults to None
+        :type stats: GenerationStats, optional
+        :param batch_rows: Rows per record batch, defaults to chunk_rows
+        :type batch_rows: int, optional
+        :param cycle: Positions of the rows of a partition in the catalog cycle and length of the
+            cycle, see _write_rows, defaults to None
+        :type cycle: tuple, optional
+        :return: Generator of record batches
+        :rtype: Iterator[pyarrow.RecordBatch]
+        """
+        batch_rows = batch_rows or self.chunk_rows or max(stop - start, 1)
+        for offset in range(start, stop, batch_rows):
+            num_rows = min(batch_rows, stop - offset)
+            rows = offset
+            if cycle is not None:
+                rows = partition_row_indices(*cycle, offset, offset + num_rows)
+                if rows[-1] - rows[0] == num_rows - 1:
+                    rows = int(rows[0])
+            yield from plan.generate(self.engine, num_rows, rows, stats).to_batches()
+
+    def generate_alphanumeric(self, name, size=1, cardinality=None):
         """
         Generates alphanumeric data.
 
@@ -135,17 +511,13 @@ class DataGenerator:
         :type name: str
         :param size: Length of the alphanumeric string, defaults to 1
         :type size: int, optional
+        :param cardinality: Number of distinct strings, defaults to no limit
+        :type cardinality: int, optional
         :return: List of alphanumeric strings
         :rtype: list
         """
-        alphanumeric_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                value = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                value = "".join(random.choices(string.ascii_letters + string.digits, k=size))
-            alphanumeric_list.append(value)
-        return alphanumeric_list
+        return self.engine.alphanumeric(name, self.num_rows, size,
+                                        cardinality=cardinality).to_pylist()
 
     def generate_int(self, name, size=1000):
         """
@@ -158,14 +530,7 @@ class DataGenerator:
         :return: List of integers
         :rtype: list
         """
-        int_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                value = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                value = random.randint(0, size)
-            int_list.append(value)
-        return int_list
+        return self.engine.integer(name, self.num_rows, size).to_pylist()
 
     def generate_decimal(self, name, decimal_precision=12, decimal_scale=6):
         """
@@ -180,14 +545,8 @@ class DataGenerator:
         :return: List of decimals
         :rtype: list
         """
-        decimal_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                value = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                value = Decimal(random.randrange(10 ** decimal_precision)) / (10 ** decimal_scale)
-            decimal_list.append(value)
-        return decimal_list
+        return self.engine.decimal(name, self.num_rows, decimal_precision,
+                                   decimal_scale).to_pylist()
 
     def generate_date(self, name, date_format='%Y-%m-%d'):
         """
@@ -200,16 +559,8 @@ class DataGenerator:
         :return: List of dates
         :rtype: list
         """
-        date_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                date = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                date = datetime.today() - timedelta(days=random.randint(0, 365 * 5))
-                date = date.strftime(date_format)
-            date_list.append(date)
-        date_list = pd.Series(date_list).apply(lambda x: datetime.strptime(x, date_format))
-        return date_list
+        dates = self.engine.date(name, self.num_rows, date_format)
+        return dates.cast(pa.timestamp("ms")).to_pandas()
 
     def generate_timestamp(self, name, date_format='%Y-%m-%d %H:%M:%S'):
         """
@@ -222,20 +573,7 @@ class DataGenerator:
         :return: List of timestamps
         :rtype: list
         """
-        timestamp_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                date = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                date = datetime.today() - timedelta(days=random.randint(0, 365 * 5),
-                                                    hours=random.randint(0, 24),
-                                                    minutes=random.randint(0, 60),
-                                                    seconds=random.randint(0, 60))
-                date = date.strftime(date_format)
-            timestamp_list.append(date)
-        timestamp_list = pd.Series(timestamp_list).apply(lambda x: datetime.strptime(x,
-                                                                                     date_format))
-        return timestamp_list
+        return self.engine.timestamp(name, self.num_rows, date_format).to_pandas()
 
     def generate_time(self, name, date_format='%H:%M:%S'):
         """
@@ -248,15 +586,26 @@ class DataGenerator:
         :return: List of times
         :rtype: list
         """
-        time_list = []
-        for counter in range(self.num_rows):
-            if name in self.catalog:
-                date = self.catalog[name][counter % len(self.catalog[name])]
-            else:
-                date = datetime.today() - timedelta(hours=random.randint(0, 24),
-                                                    minutes=random.randint(0, 60),
-                                                    seconds=random.randint(0, 60))
-                date = date.strftime(date_format)
-            time_list.append(date)
-        time_list = pd.Series(time_list).apply(lambda x: datetime.strptime(x, date_format))
-        return time_list
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        times = self.engine.time(name, self.num_rows, date_format)
+        since_midnight = times.cast(pa.int32()).to_numpy().astype("timedelta64[ms]")
+        return pd.Series(np.datetime64("1900-01-01", "ms") + since_midnight)
+
+
+def _get_plan(schema_path):
+    if isinstance(schema_path, SchemaPlan):
+        return schema_path
+    return load_plan(schema_path)
+
+
+def _write_shard(generator, *args):
+    """
+    Writes a shard of rows in a worker process.
+
+    :param generator: Generator with the catalog and settings of the run
+    :type generator: DataGenerator
+    :param args: Arguments of DataGenerator._write_rows
+    :return: Stats of the shard
+    :rtype: GenerationStats
+    """
+    return generator._write_rows(*args)  # pylint: disable=protected-access
@@ -0,0 +1,268 @@
+"""
+This module contains the DatasetPager class, which is used to read a parquet dataset in pages.
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from . import writers
+from .editor import FieldNotFoundException
+
+DEFAULT_PAGE_ROWS = 10000
+
+
+class DatasetPager:
+    """
+    Class for reading the rows of a parquet dataset page by page.
+
+    Opening a pager only reads the metadata of the files: the schema, the hive partitions and
+    the number of rows of every row group. A page only reads the row groups holding its rows,
+    and only the selected columns.
+    """
+
+    def __init__(self, path, columns=None, partition_filter=None, page_rows=DEFAULT_PAGE_ROWS):
+        """
+        Initialize the DatasetPager with the dataset path, the columns and the partitions to read.
+
+        :param path: Path of the parquet dataset
+        :type path: str
+        :param columns: Names of the columns to read, defaults to every column
+        :type columns: list, optional
+        :param partition_filter: Values of partition columns, a value or a list of values, the
+            other partitions are not read, defaults to every partition
+        :type partition_filter: dict, optional
+        :raises FieldNotFoundException: If a column of the filter is not a partition column
+        :param page_rows: Number of rows of a page, defaults to DEFAULT_PAGE_ROWS
+        :type page_rows: int, optional
+        """
+        self.path = path
+        self.page_rows = page_rows
+        self.expression = None
+        dataset = self._open()
+        self.partitions = dataset.partitioning.schema.names
+        for column, values in (partition_filter or {}).items():
+            if column not in self.partitions:
+                raise FieldNotFoundException(column)
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            condition = pc.field(column).isin([str(value) for value in values])
+            self.expression = condition if self.expression is None else self.expression & condition
+        self._discover(dataset)
+        self.schema = self.dataset.schema
+        self.columns = list(columns) if columns else self.schema.names
+
+    def _open(self):
+        return ds.dataset(self.path, format="parquet",
+                          partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+
+    def _discover(self, dataset=None):
+        """
+        Discover the files of the selected partitions and read their row groups from their
+        metadata, opening the dataset again unless it is given.
+        """
+        self.dataset = dataset or self._open()
+        self.fragments = list(self.dataset.get_fragments(filter=self.expression))
+        self.row_groups = [(fragment, row_group.id)
+                           for fragment in self.fragments for row_group in fragment.row_groups]
+        rows = [row_group.num_rows
+                for fragment in self.fragments for row_group in fragment.row_groups]
+        self.offsets = np.concatenate([[0], np.cumsum(rows, dtype=np.int64)])
+
+    @property
+    def num_rows(self):
+        """
+        Number of rows of the selected partitions.
+        """
+        return int(self.offsets[-1])
+
+    @property
+    def complete(self):
+        """
+        Whether the pager reads every column and every partition of the dataset.
+        """
+        return self.expression is None and self.columns == self.schema.names
+
+    @property
+    def num_pages(self):
+        """
+        Number of pages of the selected partitions.
+        """
+        return -(-self.num_rows // self.page_rows)
+
+    def page(self, index):
+        """
+        Read a page of rows.
+
+        :param index: Index of the page, starting at 0
+        :type index: int
+        :return: Table with the rows of the page
+        :rtype: pyarrow.Table
+        """
+        return self.read(index * self.page_rows, (index + 1) * self.page_rows)
+
+    def read(self, start, stop):
+        """
+        Read a range of rows, in the order of the files and their row groups.
+
+        :param start: Index of the first row
+        :type start: int
+        :param stop: Index after the last row, it may be after the end of the dataset
+        :type stop: int
+        :return: Table with the rows of the range
+        :rtype: pyarrow.Table
+        """
+        stop = min(stop, self.num_rows)
+        schema = pa.schema([self.schema.field(column) for column in self.columns])
+        if start >= stop:
+            return schema.empty_table()
+        first = int(np.searchsorted(self.offsets, start, side="right")) - 1
+        last = int(np.searchsorted(self.offsets, stop, side="left"))
+        tables = []
+        for fragment, row_group in self.row_groups[first:last]:
+            tables.append(fragment.subset(row_group_ids=[row_group])
+                          .to_table(schema=self.schema, columns=self.columns))
+        table = pa.concat_tables(tables)
+        return table.slice(start - int(self.offsets[first]), stop - start)
+
+    def page_dataframe(self, index, schema=None):
+        """
+        Read a page of rows as a DataFrame indexed by the position of its rows in the pager,
+        so that the rows can be put back in place after they are sorted.
+
+        :param index: Index of the page, starting at 0
+        :type index: int
+        :param schema: Schema the page is cast to before the conversion, defaults to None
+        :type schema: pyarrow.Schema, optional
+        :return: DataFrame with the rows of the page
+        :rtype: pandas.DataFrame
+        """
+        page = self.page(index)
+        if schema is not None:
+            page = page.cast(schema)
+        df = page.to_pandas()
+        df.index = range(index * self.page_rows, index * self.page_rows + page.num_rows)
+        return df
+
+    def edited_rows(self, table):
+        """
+        Find the rows that differ from the rows stored in the dataset, whatever edited them.
+        Only the rows of the table are read again.
+
+        :param table: Rows from the first one of the pager, with the selected columns
+        :type table: pyarrow.Table
+        :return: Indices of the edited rows
+        :rtype: numpy.ndarray
+        """
+        edited = np.zeros(table.num_rows, dtype=bool)
+        for column_edited in self._edited_columns(table).values():
+            edited |= column_edited
+        return np.flatnonzero(edited)
+
+    def _edited_columns(self, table):
+        """
+        Compare the rows of a table with the rows stored in the dataset, column by column.
+
+        :return: Mask of the edited rows of every column of the table
+        :rtype: dict
+        """
+        stored = self.read(0, table.num_rows)
+        edited = {}
+        for column in table.column_names:
+            values = table.column(column)
+            original = stored.column(column).cast(values.type)
+            equal = pc.fill_null(pc.equal(values, original), False)
+            both_null = pc.and_(pc.is_null(values), pc.is_null(original))
+            edited[column] = ~pc.or_(equal, both_null).to_numpy(zero_copy_only=False)
+        return edited
+
+    def save_dataframe(self, df, schema=None, parquet_options=None):
+        """
+        Write the edited rows of a DataFrame of loaded pages back into the files they were
+        read from, see rewrite. The rows are put back in place by their index, see
+        page_dataframe, and the edited rows are found by comparing them with the dataset.
+
+        :param df: DataFrame of the loaded pages, possibly sorted, with the selected columns
+        :type df: pandas.DataFrame
+        :param schema: Schema the DataFrame is cast to, defaults to the pager schema
+        :type schema: pyarrow.Schema, optional
+        :param parquet_options: Parquet writer options, see rewrite, defaults to None
+        :type parquet_options: dict, optional
+        :return: Paths of the rewritten files
+        :rtype: list
+        :raises ValueError: If rows were added or deleted, or partition columns were edited, as
+            the rows would have to move to another partition, which TableEditor.set_constants
+            does
+        """
+        df = df.sort_index()
+        if list(df.index) != list(range(len(df))):
+            raise ValueError("Rows were added or deleted, they cannot be put back in place.")
+        if schema is None:
+            schema = pa.schema([self.schema.field(column) for column in df.columns])
+        table = pa.Table.from_pandas(df, preserve_index=False).cast(schema)
+        edited = np.zeros(table.num_rows, dtype=bool)
+        for column, column_edited in self._edited_columns(table).items():
+            if column in self.partitions and column_edited.any():
+                raise ValueError(f"Partition column '{column}' was edited in "
+                                 f"{int(column_edited.sum())} rows, which cannot be saved in "
+                                 "place. Edit partitions with TableEditor.set_constants.")
+            edited |= column_edited
+        return self.rewrite(np.flatnonzero(edited), table, parquet_options)
+
+    def rewrite(self, rows, table, parquet_options=None):
+        """
+        Write edited rows back into the files they were read from, only rewriting the files of
+        the edited rows. The new files are written to a staging directory next to the dataset,
+        then renamed over the files they replace, see writers.replace_files. Partition columns
+        are not written, as they are not stored in the files.
+
+        :param rows: Indices of the edited rows
+        :type rows: Iterable[int]
+        :param table: Rows from the first one of the pager with the edits, e.g. the loaded pages,
+            with the selected columns
+        :type table: pyarrow.Table
+        :param parquet_options: Parquet writer options, see writers.write_parquet_file, defaults
+            to the row group size of each rewritten file
+        :type parquet_options: dict, optional
+        :return: Paths of the rewritten files
+        :rtype: list
+        """
+        file_starts = {}
+        for (fragment, _), start in zip(self.row_groups, self.offsets):
+            file_starts.setdefault(fragment.path, (fragment, int(start)))
+        files = list(file_starts.values())
+        starts = np.array([start for _, start in files], dtype=np.int64)
+        edited = sorted({int(np.searchsorted(starts, row, side="right")) - 1 for row in rows})
+        staging_path = writers.staging_path(self.path)
+        replacements = []
+        rewritten = []
+        try:
+            for index in edited:
+                fragment, start = files[index]
+                file_table = pq.read_table(fragment.path, partitioning=None)
+                stop = min(start + file_table.num_rows, table.num_rows)
+                for column in table.column_names:
+                    if column not in file_table.column_names or column in self.partitions:
+                        continue
+                    position = file_table.column_names.index(column)
+                    original = file_table.column(position)
+                    values = table.column(column).slice(start, stop - start).cast(original.type)
+                    file_table = file_table.set_column(
+                        position, file_table.schema.field(position),
+                        pa.chunked_array(values.chunks + original.slice(stop - start).chunks,
+                                         type=original.type))
+                options = parquet_options or {
+                    "row_group_size": fragment.metadata.row_group(0).num_rows or None}
+                staged = os.path.join(staging_path, os.path.relpath(fragment.path, self.path))
+                os.makedirs(os.path.dirname(staged), exist_ok=True)
+                writers.write_parquet_file(file_table, staged, options)
+                replacements.append((fragment.path, staged, fragment.path))
+            writers.replace_files(replacements, self.path, rewritten)
+        finally:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            self._discover()
+        return rewritten
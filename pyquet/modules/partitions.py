@@ -0,0 +1,212 @@
+"""
+This module contains the functions used to plan the rows of each partition of a dataset.
+"""
+
+import copy
+import math
+import os
+import zlib
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+VALUE_ROW_SPACE = 2 ** 30
+
+
+def partition_combinations(plan, engine, partitions):
+    """
+    Get the combinations of partition values found in the rows the catalog cycles through.
+
+    The catalog values of a column are cycled over the rows, so the values of the partition
+    columns repeat every least common multiple of their catalog lengths rows. Only the
+    combinations found in that cycle are returned, in the order they first appear.
+
+    :param plan: Compiled schema
+    :type plan: SchemaPlan
+    :param engine: Column engine with the catalog
+    :type engine: ColumnEngine
+    :param partitions: List of partition columns
+    :type partitions: list
+    :return: Tuple of the distinct values of each partition column, the value indices of each
+        combination, one row per combination, and the combination of every row of the cycle,
+        None if a partition column is not in the catalog or not in the schema
+    :rtype: tuple
+    """
+    fields = {field.name: field for field in plan.fields}
+    if any(partition not in fields or not engine.catalog.get(partition)
+           for partition in partitions):
+        return None
+    cycle_rows = math.lcm(*(len(engine.catalog[partition]) for partition in partitions))
+    values = []
+    codes = []
+    for partition in partitions:
+        column = fields[partition].generate(engine, cycle_rows)
+        values.append(pc.unique(column))
+        codes.append(pc.index_in(column, value_set=values[-1]).to_numpy())
+    combinations, first_rows, row_combinations = np.unique(np.stack(codes, axis=1), axis=0,
+                                                           return_index=True,
+                                                           return_inverse=True)
+    order = np.argsort(first_rows)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return values, combinations[order], rank[row_combinations.reshape(-1)]
+
+
+def split_rows(num_rows, num_partitions, skew=0):
+    """
+    Split the rows between partitions, the k-th partition getting a share proportional to
+    1 / (k + 1) ** skew. A skew of 0 splits the rows evenly.
+
+    :param num_rows: Number of rows to split
+    :type num_rows: int
+    :param num_partitions: Number of partitions
+    :type num_partitions: int
+    :param skew: Exponent of the share of each partition, defaults to 0
+    :type skew: float, optional
+    :return: Number of rows of each partition
+    :rtype: list
+    """
+    weights = 1 / np.arange(1, num_partitions + 1, dtype=np.float64) ** skew
+    shares = num_rows * weights / weights.sum()
+    counts = np.floor(shares).astype(np.int64)
+    remainder = num_rows - int(counts.sum())
+    counts[np.argsort(counts - shares, kind="stable")[:remainder]] += 1
+    return counts.tolist()
+
+
+def existing_partitions(target_path, partitions):
+    """
+    Get the partition directories of a dataset that already have files.
+
+    :param target_path: Path of the dataset directory
+    :type target_path: str
+    :param partitions: List of partition columns
+    :type partitions: list
+    :return: Relative directories of the existing partitions
+    :rtype: set
+    """
+    existing = set()
+    if not os.path.isdir(target_path):
+        return existing
+    for root, _, files in os.walk(target_path):
+        directory = os.path.relpath(root, target_path).replace(os.sep, "/")
+        names = [segment.split("=", 1)[0] for segment in directory.split("/")]
+        if files and names == list(partitions):
+            existing.add(directory)
+    return existing
+
+
+def plan_partitions(plan,
+                    engine,
+                    partitions,
+                    num_rows,
+                    partition_rows=None,
+                    skew=0,
+                    values=None,
+                    skip=None):
+    """
+    Plan the rows of every combination of partition values found in the catalog, see
+    partition_combinations.
+
+    The rows of a combination are the global rows holding its values in the catalog cycle, not
+    a new range of rows, so the other catalog columns stay paired with the partition values and
+    a partition gets the rows of a full generation. Each partition is generated independently
+    of the others and written straight into its directory. By default each combination gets the
+    rows it has among the first num_rows rows, otherwise its first rows, see
+    partition_row_indices.
+
+    The partitions of given values are not in the catalog cycle: their rows are consecutive from
+    an offset derived from their directory, a multiple of VALUE_ROW_SPACE, so a partition added
+    on a later run, e.g. a new cutoff date, does not repeat the rows of the catalog partitions
+    or of the partitions added before.
+
+    :param plan: Compiled schema
+    :type plan: SchemaPlan
+    :param engine: Column engine with the catalog
+    :type engine: ColumnEngine
+    :param partitions: List of partition columns
+    :type partitions: list
+    :param num_rows: Number of rows of the dataset, split between partitions
+    :type num_rows: int
+    :param partition_rows: Rows of each partition, either a number of rows for every partition
+        or a dict from the partition values, as a tuple or a comma separated string, to its
+        rows, partitions missing from the dict are not generated, defaults to splitting num_rows
+    :type partition_rows: int or dict, optional
+    :param skew: Skew of num_rows split between partitions, see split_rows, defaults to 0,
+        keeping the rows of the catalog cycle
+    :type skew: float, optional
+    :param values: Values of partition columns replacing their catalog values, their partitions
+        getting rows of their own, defaults to None
+    :type values: dict, optional
+    :param skip: Relative directories of the partitions not to generate, defaults to None
+    :type skip: set, optional
+    :return: Relative directory, positions of the rows in the catalog cycle, length of the cycle
+        and number of rows of each partition, None if the partition values are not in the
+        catalog
+    :rtype: list
+    """
+    import pyarrow.dataset as ds  # pylint: disable=import-outside-toplevel
+    if values:
+        engine = copy.copy(engine)
+        engine.catalog = {**engine.catalog, **values}
+    found = partition_combinations(plan, engine, partitions)
+    if found is None:
+        return None
+    columns, codes, row_combinations = found
+    partitioning = ds.partitioning(pa.schema([(partition, column.type)
+                                              for partition, column in zip(partitions, columns)]),
+                                   flavor="hive")
+    combinations = [[column[int(code)] for column, code in zip(columns, combination)]
+                    for combination in codes]
+    if isinstance(partition_rows, dict):
+        keys = [tuple(str(value.as_py()) for value in combination)
+                for combination in combinations]
+        counts = [partition_rows.get(key, partition_rows.get(",".join(key), 0)) for key in keys]
+    elif partition_rows is not None:
+        counts = [partition_rows] * len(combinations)
+    elif skew:
+        counts = split_rows(num_rows, len(combinations), skew)
+    else:
+        cycles, remainder = divmod(num_rows, len(row_combinations))
+        counts = (cycles * np.bincount(row_combinations, minlength=len(combinations))
+                  + np.bincount(row_combinations[:remainder], minlength=len(combinations)))
+        counts = counts.tolist()
+
+    planned = []
+    for index, (combination, count) in enumerate(zip(combinations, counts)):
+        if not count:
+            continue
+        expression = pc.scalar(True)
+        for partition, value in zip(partitions, combination):
+            expression = expression & (pc.field(partition) == value)
+        directory, _ = partitioning.format(expression)
+        if directory in (skip or ()):
+            continue
+        if values:
+            offset = zlib.crc32(directory.encode("utf-8")) * VALUE_ROW_SPACE
+            planned.append((directory, np.array([offset], dtype=np.int64), 1, int(count)))
+        else:
+            positions = np.flatnonzero(row_combinations == index).astype(np.int64)
+            planned.append((directory, positions, len(row_combinations), int(count)))
+    return planned
+
+
+def partition_row_indices(positions, stride, start, stop):
+    """
+    Get the global indices of the rows start to stop of a partition, whose k-th row is at
+    positions[k % len(positions)] of the (k // len(positions))-th cycle of stride rows.
+
+    :param positions: Ascending positions of the rows of the partition in a cycle
+    :type positions: numpy.ndarray
+    :param stride: Number of rows of a cycle
+    :type stride: int
+    :param start: Index of the first row in the partition
+    :type start: int
+    :param stop: Index after the last row in the partition
+    :type stop: int
+    :return: Ascending global indices of the rows
+    :rtype: numpy.ndarray
+    """
+    cycles, index = np.divmod(np.arange(start, stop, dtype=np.int64), len(positions))
+    return positions[index] + cycles * stride
@@ -0,0 +1,230 @@
+"""
+This module contains the SchemaPlan class, which is used to compile schemas once and reuse them.
+"""
+
+import copy
+import json
+import os.path
+import re
+import time
+from functools import lru_cache
+
+import pyarrow as pa
+
+from . import common
+from .columns import decimal_arrow_type
+
+PLAN_CACHE_SIZE = 1024
+
+
+class FieldPlan:
+    """
+    A compiled field: the column engine method generating it and its Arrow type.
+    """
+
+    def __init__(self, name, logical_format, method, arrow_type, **kwargs):
+        """
+        Initialize the FieldPlan.
+
+        :param name: Name of the field
+        :type name: str
+        :param logical_format: Logical format of the field in the schema
+        :type logical_format: str
+        :param method: Name of the ColumnEngine method generating the field
+        :type method: str
+        :param arrow_type: Arrow type of the field
+        :type arrow_type: pyarrow.DataType
+        :param kwargs: Keyword arguments of the ColumnEngine method
+        """
+        self.name = name
+        self.logical_format = logical_format
+        self.method = method
+        self.arrow_type = arrow_type
+        self.kwargs = kwargs
+
+    def generate(self, engine, num_rows, offset=0):
+        """
+        Generates the column of the field.
+
+        :param engine: Column engine generating the values
+        :type engine: ColumnEngine
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :return: Array of values
+        :rtype: pyarrow.Array
+        """
+        return getattr(engine, self.method)(self.name, num_rows, offset=offset, **self.kwargs)
+
+
+def _alphanumeric(name, data_type, match):
+    return FieldPlan(name, data_type, "alphanumeric", pa.string(), size=int(match.group(1)))
+
+
+def _numeric_short(name, data_type, _):
+    return FieldPlan(name, data_type, "integer", pa.int64())
+
+
+def _decimal(name, data_type, match):
+    decimal_precision = int(match.group(1))
+    decimal_scale = int(match.group(2)) if match.group(2) else 0
+    return FieldPlan(name, data_type, "decimal",
+                     decimal_arrow_type(decimal_precision, decimal_scale),
+                     decimal_precision=decimal_precision, decimal_scale=decimal_scale)
+
+
+def _date(name, data_type, _):
+    return FieldPlan(name, data_type, "date", pa.date32())
+
+
+def _timestamp(name, data_type, _):
+    return FieldPlan(name, data_type, "timestamp", pa.timestamp("ms"))
+
+
+def _time(name, data_type, _):
+    return FieldPlan(name, data_type, "time", pa.time32("ms"))
+
+
+LOGICAL_FORMATS = [
+    (re.compile(r"ALPHANUMERIC\(([0-9]+)\)"), _alphanumeric),
+    (re.compile(r"NUMERIC SHORT\b"), _numeric_short),
+    (re.compile(r"DECIMAL\(([0-9]+),?\s*([0-9]*)\)"), _decimal),
+    (re.compile(r"DATE\b"), _date),
+    (re.compile(r"TIMESTAMP\b"), _timestamp),
+    (re.compile(r"TIME\b"), _time),
+]
+
+
+class SchemaPlan:
+    """
+    A compiled schema: the plan of every field and the target Arrow schema.
+    """
+
+    def __init__(self, schema):
+        """
+        Compile the fields of a schema.
+
+        :param schema: Schema with the fields to generate, an alphanumeric field may set a
+            cardinality, the number of distinct values it is generated with
+        :type schema: dict
+        """
+        self.schema = schema
+        self.name = schema.get("name")
+        self.physical_path = schema.get("physicalPath")
+        self.fields = []
+        for field in schema.get("fields", []):
+            field_plan = compile_field(field["name"], field["logicalFormat"],
+                                       field.get("cardinality"))
+            if field_plan:
+                self.fields.append(field_plan)
+            else:
+                print("Unrecognized logicalFormat:", field["logicalFormat"])
+        self.arrow_schema = pa.schema([(field.name, field.arrow_type) for field in self.fields])
+
+    def generate(self, engine, num_rows, offset=0, stats=None):
+        """
+        Generates a table with the rows from offset to offset + num_rows, or with the rows of
+        the given global indices.
+
+        :param engine: Column engine generating the values
+        :type engine: ColumnEngine
+        :param num_rows: Number of rows to generate
+        :type num_rows: int
+        :param offset: Global index of the first row, or the ascending global indices of the
+            rows, defaults to 0
+        :type offset: int or numpy.ndarray, optional
+        :param stats: Stats timing each column and the table assembly, defaults to None
+        :type stats: GenerationStats, optional
+        :return: Table of generated rows
+        :rtype: pyarrow.Table
+        """
+        if stats is None:
+            return pa.Table.from_arrays([field.generate(engine, num_rows, offset)
+                                         for field in self.fields],
+                                        schema=self.arrow_schema)
+        columns = []
+        for field in self.fields:
+            start = time.perf_counter()
+            columns.append(field.generate(engine, num_rows, offset))
+            stats.add_column(field.name, time.perf_counter() - start)
+        start = time.perf_counter()
+        table = pa.Table.from_arrays(columns, schema=self.arrow_schema)
+        stats.assemble_seconds += time.perf_counter() - start
+        stats.rows += num_rows
+        return table
+
+    def drop(self, names):
+        """
+        Returns the plan without the given fields.
+
+        :param names: Names of the fields to drop
+        :type names: list
+        :return: Plan of the remaining fields
+        :rtype: SchemaPlan
+        """
+        plan = copy.copy(self)
+        plan.fields = [field for field in self.fields if field.name not in names]
+        plan.arrow_schema = pa.schema([(field.name, field.arrow_type) for field in plan.fields])
+        return plan
+
+
+def compile_field(name, data_type, cardinality=None):
+    """
+    Compile a field from its logical format.
+
+    :param name: Name of the field
+    :type name: str
+    :param data_type: Logical format of the field
+    :type data_type: str
+    :param cardinality: Number of distinct values of an alphanumeric field, which is then
+        dictionary encoded, defaults to no limit
+    :type cardinality: int, optional
+    :return: Plan of the field, None if the logical format is not recognized
+    :rtype: FieldPlan
+    """
+    for pattern, build in LOGICAL_FORMATS:
+        match = pattern.match(data_type)
+        if match:
+            field_plan = build(name, data_type, match)
+            if cardinality and field_plan.method == "alphanumeric":
+                field_plan.arrow_type = pa.dictionary(pa.int32(), pa.string())
+                field_plan.kwargs["cardinality"] = int(cardinality)
+            return field_plan
+    return None
+
+
+def compile_schema(schema):
+    """
+    Compile a schema, reusing the plan of any schema with the same content.
+
+    :param schema: Schema with the fields to generate
+    :type schema: dict
+    :return: Compiled schema
+    :rtype: SchemaPlan
+    """
+    return _compile_content(json.dumps(schema, sort_keys=True))
+
+
+def load_plan(path):
+    """
+    Read and compile a schema file, reusing the plan while the file is not modified.
+
+    :param path: Path to the schema file
+    :type path: str
+    :return: Compiled schema
+    :rtype: SchemaPlan
+    """
+    stat = os.stat(path)
+    return _load_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_content(content):
+    return SchemaPlan(json.loads(content))
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _load_file(path, mtime_ns, size):  # pylint: disable=unused-argument
+    return compile_schema(common.read_json(path))
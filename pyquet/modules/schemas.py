@@ -6,9 +6,8 @@ import json
 import os.path
 import re
 
-import pandas as pd
-
 from . import common
+from .plan import compile_schema
 
 
 class Reader:
@@ -41,13 +40,36 @@ class Reader:
                 self._read_schema(schema)
         else:
             print("Invalid input type.", arg)
-        self.schemas_df = pd.DataFrame.from_dict(self.schemas_dict, orient="index")
-        self.schemas_df = self.schemas_df.fillna("")
-        self.schemas_dict = self.schemas_df.to_dict(orient="index")
+        keys = list(dict.fromkeys(key for schema in self.schemas_dict.values() for key in schema))
+        self.schemas_dict = {path: {key: _fill_missing(schema.get(key)) for key in keys}
+                             for path, schema in self.schemas_dict.items()}
+        self._schemas_df = None
         self.unique_fields = self.__get_unique_fields()
         self.unique_partitions = self.__get_unique_partitions()
         self.unique_data_types = self.__get_unique_data_types()
 
+    @property
+    def schemas_df(self):
+        """
+        DataFrame of the schemas, one row per schema path. It is built on first use, so that
+        pandas is only imported when needed.
+        """
+        if self._schemas_df is None:
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+            self._schemas_df = pd.DataFrame.from_dict(self.schemas_dict, orient="index")
+        return self._schemas_df
+
+    def get_plan(self, path):
+        """
+        Get the compiled plan of a schema read by the Reader.
+
+        :param path: Path of the schema
+        :type path: str
+        :return: Compiled schema, shared with any other schema with the same content
+        :rtype: SchemaPlan
+        """
+        return compile_schema(self.schemas_dict[path])
+
     def _read_schema(self, path):
         try:
             self.schemas_dict[path] = common.read_json(path)
@@ -71,3 +93,12 @@ class Reader:
             field["logicalFormat"] for schema in self.schemas_dict.values()
             if "fields" in schema for field in schema["fields"]
         })
+
+
+def _fill_missing(value):
+    """
+    Replaces a missing schema key or null value by an empty string.
+    """
+    if value is None or value != value:  # pylint: disable=comparison-with-itself
+        return ""
+    return value
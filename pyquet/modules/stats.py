@@ -0,0 +1,134 @@
+"""
+This module contains the GenerationStats class, which is used to time the stages of a generation.
+"""
+
+import os
+import sys
+
+
+class GenerationStats:
+    """
+    Timings, output size and peak memory of a generation.
+
+    The seconds of the column, assemble and write stages are summed over the worker processes,
+    so with several workers they may add up to more than the total seconds.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty stats.
+        """
+        self.rows = 0
+        self.column_seconds = {}
+        self.assemble_seconds = 0.0
+        self.stream_seconds = 0.0
+        self.total_seconds = 0.0
+        self.bytes_written = 0
+        self.files_written = 0
+        self.peak_rss_bytes = None
+        self.cached = False
+
+    def add_column(self, name, seconds):
+        """
+        Adds the time spent generating a column.
+
+        :param name: Name of the field
+        :type name: str
+        :param seconds: Seconds spent
+        :type seconds: float
+        """
+        self.column_seconds[name] = self.column_seconds.get(name, 0.0) + seconds
+
+    def merge(self, other):
+        """
+        Adds the timings and rows of the stats of a shard.
+
+        :param other: Stats of the shard
+        :type other: GenerationStats
+        """
+        self.rows += other.rows
+        for name, seconds in other.column_seconds.items():
+            self.add_column(name, seconds)
+        self.assemble_seconds += other.assemble_seconds
+        self.stream_seconds += other.stream_seconds
+
+    @property
+    def write_seconds(self):
+        """
+        Seconds spent writing, the time streaming the rows not spent generating them.
+        """
+        return max(self.stream_seconds - sum(self.column_seconds.values())
+                   - self.assemble_seconds, 0.0)
+
+    def to_dict(self):
+        """
+        Returns the stats as a dict that can be logged as JSON.
+
+        :return: Stats of the generation
+        :rtype: dict
+        """
+        return {
+            "rows": self.rows,
+            "column_seconds": dict(self.column_seconds),
+            "generate_seconds": sum(self.column_seconds.values()),
+            "assemble_seconds": self.assemble_seconds,
+            "write_seconds": self.write_seconds,
+            "total_seconds": self.total_seconds,
+            "bytes_written": self.bytes_written,
+            "files_written": self.files_written,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "cached": self.cached,
+        }
+
+    def format(self):
+        """
+        Formats the stats as a table of stages.
+
+        :return: Breakdown of the generation
+        :rtype: str
+        """
+        width = max([len("assemble")] + [len(name) + 2 for name in self.column_seconds])
+        lines = [f"{'stage':<{width}} {'seconds':>9}"]
+        lines.append(f"{'generate':<{width}} {sum(self.column_seconds.values()):>9.3f}")
+        for name, seconds in sorted(self.column_seconds.items(), key=lambda item: -item[1]):
+            lines.append(f"{'  ' + name:<{width}} {seconds:>9.3f}")
+        lines.append(f"{'assemble':<{width}} {self.assemble_seconds:>9.3f}")
+        lines.append(f"{'write':<{width}} {self.write_seconds:>9.3f}")
+        lines.append(f"{'total':<{width}} {self.total_seconds:>9.3f}")
+        lines.append(f"rows: {self.rows}, bytes written: {self.bytes_written}, "
+                     f"files written: {self.files_written}, "
+                     f"peak RSS: {self.peak_rss_bytes} bytes"
+                     + (", reused from cache" if self.cached else ""))
+        return "\n".join(lines)
+
+
+def peak_rss():
+    """
+    Get the peak resident set size of the process and of its finished child processes.
+
+    :return: Peak RSS in bytes, None where the resource module is not available
+    :rtype: int
+    """
+    try:
+        import resource  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    peak_rss_bytes = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                         resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak_rss_bytes if sys.platform == "darwin" else peak_rss_bytes * 1024
+
+
+def tree_size(path):
+    """
+    Get the number of files and bytes of a file or directory.
+
+    :param path: Path of the file or directory
+    :type path: str
+    :return: Tuple of number of files and bytes
+    :rtype: tuple
+    """
+    if os.path.isfile(path):
+        return 1, os.path.getsize(path)
+    sizes = [os.path.getsize(os.path.join(root, file))
+             for root, _, files in os.walk(path) for file in files]
+    return len(sizes), sum(sizes)
@@ -0,0 +1,416 @@
+"""
+This module contains the functions used to write streams of record batches to disk.
+
+Every output type but csv is written as a dataset directory by a writer registered in WRITERS.
+pyarrow.dataset is imported by the dataset writers only, as importing it also imports pandas.
+"""
+
+import json
+import os
+import uuid
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+
+DEFAULT_ROW_GROUP_SIZE = 1024 * 1024
+CSV_EXTENSIONS = {
+    None: ".csv",
+    "gzip": ".csv.gz",
+    "bz2": ".csv.bz2",
+    "zstd": ".csv.zst",
+    "lz4": ".csv.lz4",
+}
+
+
+def parquet_write_kwargs(parquet_options=None):
+    """
+    Translate parquet writer options to keyword arguments of pyarrow.dataset.write_dataset.
+
+    The options are row_group_size and max_rows_per_file, and the file options compression,
+    compression_level, use_dictionary, data_page_size, write_statistics and write_page_index
+    of pyarrow.parquet. When row_group_size is set, every row group but the last of each file
+    has exactly row_group_size rows.
+
+    :param parquet_options: Parquet writer options, defaults to None
+    :type parquet_options: dict, optional
+    :return: Keyword arguments of pyarrow.dataset.write_dataset
+    :rtype: dict
+    """
+    import pyarrow.dataset as ds  # pylint: disable=import-outside-toplevel
+    options = dict(parquet_options or {})
+    row_group_size = options.pop("row_group_size", None)
+    max_rows_per_file = options.pop("max_rows_per_file", None)
+    kwargs = {"file_options": ds.ParquetFileFormat().make_write_options(**options)}
+    if max_rows_per_file:
+        kwargs["max_rows_per_file"] = max_rows_per_file
+        row_group_size = min(row_group_size or DEFAULT_ROW_GROUP_SIZE, max_rows_per_file)
+    if row_group_size:
+        kwargs["min_rows_per_group"] = row_group_size
+        kwargs["max_rows_per_group"] = row_group_size
+    return kwargs
+
+
+def write_parquet(batches,
+                  schema,
+                  target_path,
+                  partitions=None,
+                  basename_template=None,
+                  parquet_options=None):
+    """
+    Write record batches to a parquet dataset as they are generated.
+
+    :param batches: Iterable of record batches
+    :type batches: Iterable[pyarrow.RecordBatch]
+    :param schema: Schema of the record batches
+    :type schema: pyarrow.Schema
+    :param target_path: Path of the dataset directory
+    :type target_path: str
+    :param partitions: List of partition columns, defaults to None
+    :type partitions: list, optional
+    :param basename_template: Template of the file names, defaults to a random prefix
+    :type basename_template: str, optional
+    :param parquet_options: Parquet writer options, see parquet_write_kwargs, defaults to None
+    :type parquet_options: dict, optional
+    """
+    _write_arrow_dataset(batches, schema, target_path, partitions, basename_template, "parquet",
+                         **parquet_write_kwargs(parquet_options))
+
+
+def write_parquet_file(table, target_path, parquet_options=None):
+    """
+    Write a table to a single parquet file, with the file options and row group size of the
+    parquet writer options. max_rows_per_file does not apply to a single file.
+
+    :param table: Table to write
+    :type table: pyarrow.Table
+    :param target_path: Path of the parquet file
+    :type target_path: str
+    :param parquet_options: Parquet writer options, see parquet_write_kwargs, defaults to None
+    :type parquet_options: dict, optional
+    """
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+    options = dict(parquet_options or {})
+    options.pop("max_rows_per_file", None)
+    options.setdefault("row_group_size", DEFAULT_ROW_GROUP_SIZE)
+    pq.write_table(table, target_path, **options)
+
+
+def staging_path(path):
+    """
+    Get a new staging directory next to a dataset, where its rewritten files are written before
+    they are renamed over the original files with replace_files, and which is then removed.
+
+    :param path: Path of the dataset directory
+    :type path: str
+    :return: Path of the staging directory
+    :rtype: str
+    """
+    return f"{path}_staging_{uuid.uuid4().hex}"
+
+
+def replace_files(replacements, root, replaced):
+    """
+    Rename staged files over the files they replace, removing the files moved to another
+    directory.
+
+    The directories of the targets are created first and the moved files are only removed once
+    every staged file is renamed, so the files moved before an error are removed from their new
+    directory. The files rewritten in place are renamed one by one: each one is replaced
+    atomically, but an error partway through, e.g. a permission error, leaves the files renamed
+    before it replaced and the others untouched.
+
+    :param replacements: Path of the replaced file, of the staged file and of its target
+    :type replacements: list
+    :param root: Path of the dataset directory, the directories emptied by the moves are removed
+        up to it
+    :type root: str
+    :param replaced: List the targets are appended to as they are renamed, holding the replaced
+        files when an error is raised
+    :type replaced: list
+    """
+    for _, _, target in replacements:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        for _, staged, target in replacements:
+            os.replace(staged, target)
+            replaced.append(target)
+    except Exception:
+        for source, _, target in replacements:
+            if target != source and target in replaced:
+                os.remove(target)
+                replaced.remove(target)
+                _remove_empty_dirs(os.path.dirname(target), root)
+        raise
+    for source, _, target in replacements:
+        if target != source:
+            os.remove(source)
+            _remove_empty_dirs(os.path.dirname(source), root)
+
+
+def _remove_empty_dirs(directory, root):
+    """
+    Remove a directory and its parents up to root while they are empty.
+    """
+    directory = os.path.abspath(directory)
+    root = os.path.abspath(root)
+    while directory != root and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+def write_ipc(batches, schema, target_path, partitions=None, basename_template=None, options=None):
+    """
+    Write record batches to an Arrow IPC dataset, which can be memory-mapped when read.
+
+    :param batches: Iterable of record batches
+    :type batches: Iterable[pyarrow.RecordBatch]
+    :param schema: Schema of the record batches
+    :type schema: pyarrow.Schema
+    :param target_path: Path of the dataset directory
+    :type target_path: str
+    :param partitions: List of partition columns, defaults to None
+    :type partitions: list, optional
+    :param basename_template: Template of the file names, defaults to a random prefix
+    :type basename_template: str, optional
+    :param options: Options of pyarrow.ipc.IpcWriteOptions, e.g. compression, defaults to None
+    :type options: dict, optional
+    """
+    _write_arrow_dataset(batches, schema, target_path, partitions, basename_template, "ipc",
+                         file_options=_ipc_write_options(options))
+
+
+def write_feather(batches,
+                  schema,
+                  target_path,
+                  partitions=None,
+                  basename_template=None,
+                  options=None):
+    """
+    Write record batches to a Feather (version 2) dataset, see write_ipc.
+    """
+    _write_arrow_dataset(batches, schema, target_path, partitions, basename_template, "feather",
+                         file_options=_ipc_write_options(options))
+
+
+def write_orc(batches, schema, target_path, partitions=None, basename_template=None, options=None):
+    """
+    Write record batches to an ORC dataset. ORC has no time type nor decimals of more than 38
+    digits, so those columns are written as strings, and dictionary columns are written decoded.
+
+    :param batches: Iterable of record batches
+    :type batches: Iterable[pyarrow.RecordBatch]
+    :param schema: Schema of the record batches
+    :type schema: pyarrow.Schema
+    :param target_path: Path of the dataset directory
+    :type target_path: str
+    :param partitions: List of partition columns, defaults to None
+    :type partitions: list, optional
+    :param basename_template: Template of the file names, defaults to a random prefix
+    :type basename_template: str, optional
+    :param options: Keyword arguments of pyarrow.orc.ORCWriter, e.g. compression, defaults to
+        None
+    :type options: dict, optional
+    """
+    _write_files(batches, schema, target_path, partitions,
+                 basename_template or uuid.uuid4().hex + "-{i}.orc",
+                 lambda path, file_schema: _OrcFile(path, file_schema, options))
+
+
+def write_ndjson(batches,
+                 schema,
+                 target_path,
+                 partitions=None,
+                 basename_template=None,
+                 options=None):  # pylint: disable=unused-argument
+    """
+    Write record batches to a dataset of newline-delimited JSON files, one object per row.
+    Decimals, dates, timestamps and times are written as strings.
+
+    :param batches: Iterable of record batches
+    :type batches: Iterable[pyarrow.RecordBatch]
+    :param schema: Schema of the record batches
+    :type schema: pyarrow.Schema
+    :param target_path: Path of the dataset directory
+    :type target_path: str
+    :param partitions: List of partition columns, defaults to None
+    :type partitions: list, optional
+    :param basename_template: Template of the file names, defaults to a random prefix
+    :type basename_template: str, optional
+    :param options: Unused, as the JSON lines have no options
+    :type options: dict, optional
+    """
+    _write_files(batches, schema, target_path, partitions,
+                 basename_template or uuid.uuid4().hex + "-{i}.json",
+                 lambda path, _: _NdjsonFile(path))
+
+
+def register_writer(output_type, write, extension):
+    """
+    Register the writer of an output type.
+
+    :param output_type: Name of the output type
+    :type output_type: str
+    :param write: Function with the signature of write_ipc
+    :type write: callable
+    :param extension: Extension of the file names
+    :type extension: str
+    """
+    WRITERS[output_type] = (write, extension)
+
+
+def _write_arrow_dataset(batches,
+                         schema,
+                         target_path,
+                         partitions,
+                         basename_template,
+                         file_format,
+                         **kwargs):
+    import pyarrow.dataset as ds  # pylint: disable=import-outside-toplevel
+    if not basename_template:
+        basename_template = uuid.uuid4().hex + "-{i}" + WRITERS[file_format][1]
+    reader = pa.RecordBatchReader.from_batches(schema, batches)
+    ds.write_dataset(reader,
+                     target_path,
+                     format=file_format,
+                     partitioning=partitions or None,
+                     partitioning_flavor="hive" if partitions else None,
+                     basename_template=basename_template,
+                     existing_data_behavior="overwrite_or_ignore",
+                     **kwargs)
+
+
+def _ipc_write_options(options):
+    if not options:
+        return None
+    import pyarrow.dataset as ds  # pylint: disable=import-outside-toplevel
+    return ds.IpcFileFormat().make_write_options(**options)
+
+
+def _write_files(batches, schema, target_path, partitions, basename_template, open_file):
+    """
+    Write record batches to a format without an Arrow dataset writer, one file per partition
+    directory.
+
+    :param open_file: Function opening a file from its path and the schema of its rows, returning
+        an object with write(table) and close() methods
+    :type open_file: callable
+    """
+    import pyarrow.dataset as ds  # pylint: disable=import-outside-toplevel
+    partitions = partitions or []
+    data_schema = pa.schema([field for field in schema if field.name not in partitions])
+    partitioning = ds.partitioning(pa.schema([schema.field(name) for name in partitions]),
+                                   flavor="hive")
+    os.makedirs(target_path, exist_ok=True)
+    files = {}
+    try:
+        for batch in batches:
+            table = pa.Table.from_batches([batch], schema=schema)
+            for directory, rows in _split_partitions(table, partitions, partitioning):
+                if directory not in files:
+                    path = os.path.join(target_path, directory, basename_template.format(i=0))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    files[directory] = open_file(path, data_schema)
+                files[directory].write(rows.select(data_schema.names))
+    finally:
+        for file in files.values():
+            file.close()
+
+
+def _split_partitions(table, partitions, partitioning):
+    if not partitions:
+        yield "", table
+        return
+    for key in table.group_by(partitions).aggregate([]).to_pylist():
+        expression = pc.scalar(True)
+        for name in partitions:
+            expression = expression & (pc.field(name) == key[name])
+        directory, _ = partitioning.format(expression)
+        yield directory, table.filter(expression)
+
+
+class _OrcFile:
+    def __init__(self, path, schema, options):
+        import pyarrow.orc as orc  # pylint: disable=import-outside-toplevel
+        self.schema = pa.schema([(field.name, pa.string())
+                                 if pa.types.is_time(field.type) or
+                                 pa.types.is_decimal256(field.type) else
+                                 (field.name, field.type.value_type)
+                                 if pa.types.is_dictionary(field.type) else field
+                                 for field in schema])
+        self.writer = orc.ORCWriter(path, **(options or {}))
+
+    def write(self, table):
+        self.writer.write(table.cast(self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _NdjsonFile:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def write(self, table):
+        self.file.writelines(json.dumps(row, default=str) + "\n" for row in table.to_pylist())
+
+    def close(self):
+        self.file.close()
+
+
+def csv_extension(compression=None):
+    """
+    Get the extension of the csv files written with a compression codec.
+
+    :param compression: Compression codec: gzip, bz2, zstd or lz4, defaults to no compression
+    :type compression: str, optional
+    :return: File extension
+    :rtype: str
+    """
+    if compression not in CSV_EXTENSIONS:
+        raise ValueError(f"Unsupported csv compression: {compression}. "
+                         f"Valid options are: {', '.join(filter(None, CSV_EXTENSIONS))}")
+    return CSV_EXTENSIONS[compression]
+
+
+def write_csv(batches, schema, target_path, header=True, compression=None, delimiter=","):
+    """
+    Write record batches to a csv file with the Arrow csv writer as they are generated.
+
+    The compressed files of consecutive rows can be concatenated into a single valid file, as
+    every supported codec allows several frames in a file.
+
+    :param batches: Iterable of record batches
+    :type batches: Iterable[pyarrow.RecordBatch]
+    :param schema: Schema of the record batches
+    :type schema: pyarrow.Schema
+    :param target_path: Path of the csv file
+    :type target_path: str
+    :param header: Whether to write the header line, defaults to True
+    :type header: bool, optional
+    :param compression: Compression codec: gzip, bz2, zstd or lz4, defaults to no compression
+    :type compression: str, optional
+    :param delimiter: Field delimiter, defaults to ','
+    :type delimiter: str, optional
+    """
+    csv_extension(compression)
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    write_options = pa_csv.WriteOptions(include_header=header, delimiter=delimiter)
+    if compression:
+        sink = pa.CompressedOutputStream(target_path, compression)
+    else:
+        sink = pa.OSFile(target_path, "wb")
+    with sink, pa_csv.CSVWriter(sink, schema, write_options=write_options) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+WRITERS = {
+    "parquet": (write_parquet, ".parquet"),
+    "ipc": (write_ipc, ".arrow"),
+    "feather": (write_feather, ".feather"),
+    "orc": (write_orc, ".orc"),
+    "ndjson": (write_ndjson, ".json"),
+}
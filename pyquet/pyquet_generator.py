@@ -3,11 +3,70 @@ Pyquet CLI.
 """
 
 import argparse
+import cProfile
 import json
 import logging
+import os.path
 import sys
+from datetime import datetime
 
-from pyquet.modules.generator import DataGenerator
+
+def __getattr__(name):
+    """
+    Import DataGenerator and BatchGenerator on first access, so that importing the CLI does not
+    load pyarrow and numpy.
+    """
+    # pylint: disable=import-outside-toplevel
+    if name == "DataGenerator":
+        from pyquet.modules.generator import DataGenerator
+        return DataGenerator
+    if name == "BatchGenerator":
+        from pyquet.modules.batch import BatchGenerator
+        return BatchGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def parquet_options(args):
+    """
+    Get the parquet writer options from the command line arguments.
+
+    :param args: Parsed command line arguments
+    :type args: argparse.Namespace
+    :return: Parquet writer options
+    :rtype: dict
+    """
+    options = {
+        "row_group_size": args.row_group_size,
+        "max_rows_per_file": args.max_rows_per_file,
+        "compression": args.compression,
+        "compression_level": args.compression_level,
+        "data_page_size": args.data_page_size,
+    }
+    if args.dictionary:
+        options["use_dictionary"] = {"all": True, "none": False}.get(
+            args.dictionary.lower(), args.dictionary.split(","))
+    if args.no_statistics:
+        options["write_statistics"] = False
+    if args.page_index:
+        options["write_page_index"] = True
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def csv_options(args):
+    """
+    Get the csv writer options from the command line arguments.
+
+    :param args: Parsed command line arguments
+    :type args: argparse.Namespace
+    :return: CSV writer options
+    :rtype: dict
+    """
+    options = {
+        "compression": args.csv_compression,
+        "delimiter": args.csv_delimiter,
+        "parts": args.csv_parts,
+    }
+    return {key: value for key, value in options.items() if value is not None}
 
 
 def main():
@@ -21,21 +80,22 @@ def main():
                         "-s",
                         metavar="SCHEMA_PATH",
                         type=str,
-                        help="Path to the schema file",
+                        help="Path to the schema file, or to a directory of schemas",
                         required=True)
 
     parser.add_argument("--output-type",
                         "-t",
                         metavar="OUTPUT_TYPE",
                         type=str,
-                        help="Output type, parquet or csv",
+                        help="Output type: csv, parquet, ipc, feather, orc or ndjson",
                         required=True)
 
     parser.add_argument("--destination-dir",
                         "-d",
                         metavar="DESTINATION_DIR",
                         type=str,
-                        help="Destination directory",
+                        help="Directory the table directories are written in, named after the "
+                             "schema name, defaults to the physical path of the schema",
                         required=False,
                         default=None)
 
@@ -74,13 +134,170 @@ def main():
                         help="Fixed values",
                         required=False)
 
+    parser.add_argument("--chunk-rows",
+                        metavar="CHUNK_ROWS",
+                        type=int,
+                        help="Rows per batch when streaming the output",
+                        required=False,
+                        default=None)
+
+    parser.add_argument("--workers",
+                        "-w",
+                        metavar="WORKERS",
+                        type=int,
+                        help="Number of processes generating the data",
+                        required=False,
+                        default=1)
+
+    parser.add_argument("--seed",
+                        metavar="SEED",
+                        type=int,
+                        help="Seed of the random values",
+                        required=False,
+                        default=None)
+
+    parser.add_argument("--reference-now",
+                        metavar="REFERENCE_NOW",
+                        type=datetime.fromisoformat,
+                        help="Date the random dates are counted back from, in ISO format, "
+                             "defaults to 2025-01-01 with --seed and to today otherwise",
+                        required=False,
+                        default=None)
+
+    parser.add_argument("--row-group-size",
+                        metavar="ROW_GROUP_SIZE",
+                        type=int,
+                        help="Rows per parquet row group",
+                        required=False)
+
+    parser.add_argument("--max-rows-per-file",
+                        metavar="MAX_ROWS_PER_FILE",
+                        type=int,
+                        help="Maximum rows per parquet file",
+                        required=False)
+
+    parser.add_argument("--compression",
+                        metavar="COMPRESSION",
+                        type=str,
+                        help="Parquet compression codec, e.g. snappy, gzip, zstd or none",
+                        required=False)
+
+    parser.add_argument("--compression-level",
+                        metavar="COMPRESSION_LEVEL",
+                        type=int,
+                        help="Parquet compression level",
+                        required=False)
+
+    parser.add_argument("--dictionary",
+                        metavar="DICTIONARY",
+                        type=str,
+                        help="Dictionary encoded columns: all, none or a comma separated list",
+                        required=False)
+
+    parser.add_argument("--data-page-size",
+                        metavar="DATA_PAGE_SIZE",
+                        type=int,
+                        help="Parquet data page size in bytes",
+                        required=False)
+
+    parser.add_argument("--no-statistics",
+                        help="Do not write parquet column statistics",
+                        required=False,
+                        action='store_true')
+
+    parser.add_argument("--page-index",
+                        help="Write the parquet page index",
+                        required=False,
+                        action='store_true')
+
+    parser.add_argument("--csv-compression",
+                        metavar="CSV_COMPRESSION",
+                        type=str,
+                        help="CSV compression codec: gzip, bz2, zstd or lz4",
+                        required=False)
+
+    parser.add_argument("--csv-delimiter",
+                        metavar="CSV_DELIMITER",
+                        type=str,
+                        help="CSV field delimiter",
+                        required=False)
+
+    parser.add_argument("--csv-parts",
+                        metavar="CSV_PARTS",
+                        type=int,
+                        help="Number of csv files the rows are split in, written in a directory",
+                        required=False)
+
+    parser.add_argument("--partition-rows",
+                        metavar="PARTITION_ROWS",
+                        type=json.loads,
+                        help="Rows of each partition, a number or a JSON object from the "
+                             "partition values to their rows",
+                        required=False)
+
+    parser.add_argument("--partition-skew",
+                        metavar="PARTITION_SKEW",
+                        type=float,
+                        help="Skew of the rows split between partitions, 0 splits them evenly",
+                        required=False,
+                        default=0)
+
+    parser.add_argument("--append",
+                        help="Only add the partitions missing from the existing dataset",
+                        required=False,
+                        action='store_true')
+
+    parser.add_argument("--partition-values",
+                        metavar="PARTITION_VALUES",
+                        type=json.loads,
+                        help="JSON object from partition columns to the values to generate",
+                        required=False)
+
+    parser.add_argument("--cache-dir",
+                        metavar="CACHE_DIR",
+                        type=str,
+                        help="Directory of the cache of generated datasets",
+                        required=False)
+
+    parser.add_argument("--cache-max-bytes",
+                        metavar="CACHE_MAX_BYTES",
+                        type=int,
+                        help="Maximum size of the cache of generated datasets",
+                        required=False)
+
+    parser.add_argument("--profile",
+                        metavar="PROFILE_PATH",
+                        nargs="?",
+                        const="",
+                        type=str,
+                        help="Print the time of each generation stage, and dump a cProfile of "
+                             "the main process to PROFILE_PATH if given",
+                        required=False)
+
     if len(sys.argv) == 1:
         parser.print_help()
         sys.exit(0)
 
     args = parser.parse_args()
 
-    generator = DataGenerator(args.catalog_path, args.num_rows, args.limit_rows)
+    # Imported after parsing, so that --help and argument errors do not load pyarrow and numpy.
+    # pylint: disable=import-outside-toplevel
+    from pyquet.modules.batch import BatchGenerator
+    from pyquet.modules.generator import DataGenerator
+
+    generator = DataGenerator(catalog_path=args.catalog_path,
+                              num_rows=args.num_rows,
+                              limit_rows=args.limit_rows,
+                              chunk_rows=args.chunk_rows,
+                              workers=args.workers,
+                              seed=args.seed,
+                              reference_now=args.reference_now,
+                              parquet_options=parquet_options(args),
+                              partition_rows=args.partition_rows,
+                              partition_skew=args.partition_skew,
+                              cache_dir=args.cache_dir,
+                              cache_max_bytes=args.cache_max_bytes,
+                              csv_options=csv_options(args))
 
 
     if args.fixed_values:
@@ -88,6 +305,39 @@ def main():
         fixed_values = json.loads(args.fixed_values)
         generator.catalog.update(fixed_values)
 
-    partitions = args.partitions.split(",")
+    partitions = args.partitions.split(",") if args.partitions else None
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    if os.path.isdir(args.schema_path):
+        batch = BatchGenerator(generator, args.schema_path)
+        summary = batch.generate_data(args.output_type,
+                                      partitions,
+                                      destination_dir=args.destination_dir,
+                                      append=args.append,
+                                      partition_values=args.partition_values)
+        print(BatchGenerator.format_summary(summary))
+        if args.profile is not None:
+            for table in summary:
+                print(table["table"] + ":", json.dumps(table["stats"], indent=2))
+    else:
+        generator.generate_data(args.schema_path,
+                                args.output_type,
+                                partitions,
+                                destination_dir=args.destination_dir,
+                                append=args.append,
+                                partition_values=args.partition_values)
+        if args.profile is not None:
+            print(generator.last_stats.format())
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print("Profile written in:", args.profile)
+
 
-    generator.generate_data(args.schema_path, args.output_type, partitions, args.destination_dir)
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
 from setuptools import setup, find_packages
 
 here = os.path.abspath(os.path.dirname(__file__))
@@ -16,9 +17,12 @@ with open(os.path.join(here, "requirements.txt")) as f:
 with open(os.path.join(here, "requirements_dev.txt")) as f:
     test_requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
 
+with open(os.path.join(here, "pyquet", "__init__.py")) as f:
+    version = re.search(r'__version__ = "(.+)"', f.read()).group(1)
+
 setup(
     name='pyquet',
-    version='1.0.6',
+    version=version,
     description='Generate pseudorandom data from .json schemas',
     author='Ricardo Múgica',
     author_email='rmugicag@gmail.com',
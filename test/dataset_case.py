@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+import pyarrow.dataset as ds
+
+from pyquet.modules.generator import DataGenerator
+from pyquet.modules.plan import compile_schema
+
+
+class DatasetTestCase(unittest.TestCase):
+    """
+    Generates a parquet dataset of 30 rows partitioned by cutoff_date, 10 rows per cutoff date,
+    in row groups of 4 rows.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.plan = compile_schema({
+            "name": "test_table",
+            "fields": [
+                {"name": "alphanumeric_field", "logicalFormat": "ALPHANUMERIC(10)"},
+                {"name": "numeric_short_field", "logicalFormat": "NUMERIC SHORT"},
+                {"name": "cutoff_date", "logicalFormat": "DATE"}
+            ]
+        })
+        generator = DataGenerator(num_rows=30, seed=42, parquet_options={"row_group_size": 4})
+        generator.catalog["cutoff_date"] = ["2025-01-31", "2025-02-28", "2025-03-31"]
+        self.path, self.schema = generator.generate_data(
+            self.plan, "parquet", ["cutoff_date"],
+            destination_path=os.path.join(self.tmp_dir.name, "test_table"))
+        self.table = ds.dataset(self.path, partitioning="hive").to_table()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
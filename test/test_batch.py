@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from pyquet.modules.batch import BatchGenerator
+from pyquet.modules.generator import DataGenerator
+
+
+class TestBatchGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.schemas_dir = os.path.join(self.test_dir.name, "schemas")
+        self.output_dir = os.path.join(self.test_dir.name, "output")
+        os.makedirs(self.schemas_dir)
+        for name in ["table_1", "table_2", "table_3"]:
+            schema = {
+                "name": name,
+                "partitions": ["partition_field"],
+                "fields": [
+                    {"name": "partition_field", "logicalFormat": "ALPHANUMERIC(2)"},
+                    {"name": name + "_field", "logicalFormat": "NUMERIC SHORT"}
+                ]
+            }
+            with open(os.path.join(self.schemas_dir, name + ".json"), "w") as f:
+                json.dump(schema, f)
+        with open(os.path.join(self.schemas_dir, "not_a_schema.json"), "w") as f:
+            json.dump({"test": "data"}, f)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_generate_data(self):
+        generator = DataGenerator(num_rows=12, workers=2)
+        generator.catalog["partition_field"] = ["ES", "PE"]
+        summary = BatchGenerator(generator, self.schemas_dir).generate_data("parquet",
+                                                                            destination_dir=self.output_dir)
+
+        self.assertListEqual([table["table"] for table in summary], ["table_1", "table_2", "table_3"])
+        for table in summary:
+            self.assertIsNone(table["error"])
+            self.assertEqual(table["rows"], 12)
+            self.assertGreater(table["bytes"], 0)
+            self.assertEqual(len(pd.read_parquet(table["path"])), 12)
+            self.assertEqual(len(os.listdir(table["path"])), 2)
+        self.assertIn("table_3", BatchGenerator.format_summary(summary))
+
+    def test_generate_data_rows(self):
+        generator = DataGenerator(num_rows=10, partition_rows=50)
+        generator.catalog["partition_field"] = ["ES", "PE"]
+        batch = BatchGenerator(generator, self.schemas_dir)
+        summary = batch.generate_data("parquet", destination_dir=self.output_dir)
+        appended = batch.generate_data("parquet", destination_dir=self.output_dir, append=True)
+
+        self.assertListEqual([table["rows"] for table in summary], [100, 100, 100])
+        self.assertListEqual([table["rows"] for table in appended], [0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
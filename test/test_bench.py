@@ -0,0 +1,22 @@
+import unittest
+
+from pyquet.bench import run_benchmarks
+
+
+class TestBench(unittest.TestCase):
+
+    def test_run_benchmarks(self):
+        report = run_benchmarks(sizes=[100], schema_counts=[3], cases="generate_int|parquet|reader")
+        results = {result["case"]: result for result in report["results"]}
+
+        self.assertListEqual(sorted(results), ["generate_data_parquet", "generate_int", "reader"])
+        self.assertEqual(results["reader"]["rows"], 3)
+        for result in results.values():
+            self.assertIsNone(result["error"])
+            self.assertGreater(result["rows_per_second"], 0)
+        self.assertGreater(results["generate_data_parquet"]["mb_per_second"], 0)
+        self.assertIsNone(results["generate_int"]["bytes"])
+
+
+if __name__ == '__main__':
+    unittest.main()
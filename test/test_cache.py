@@ -0,0 +1,45 @@
+import os
+import tempfile
+import time
+import unittest
+
+from pyquet.modules.cache import DatasetCache
+
+
+class TestDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.cache = DatasetCache(os.path.join(self.test_dir.name, "cache"))
+        self.source_path = os.path.join(self.test_dir.name, "source")
+        os.makedirs(os.path.join(self.source_path, "part=1"))
+        with open(os.path.join(self.source_path, "part=1", "file.parquet"), "w") as f:
+            f.write("x" * 100)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_key(self):
+        self.assertEqual(DatasetCache.key(a=1, b=[1, 2]), DatasetCache.key(b=[1, 2], a=1))
+        self.assertNotEqual(DatasetCache.key(a=1), DatasetCache.key(a=2))
+
+    def test_store_fetch(self):
+        target_path = os.path.join(self.test_dir.name, "target")
+        self.assertFalse(self.cache.fetch("key", target_path))
+        self.cache.store("key", self.source_path)
+        self.assertTrue(self.cache.fetch("key", target_path))
+        with open(os.path.join(target_path, "part=1", "file.parquet")) as f:
+            self.assertEqual(f.read(), "x" * 100)
+
+    def test_evict(self):
+        for key in ("first", "second", "third"):
+            self.cache.store(key, self.source_path)
+            os.utime(os.path.join(self.cache.cache_dir, key), (time.time() - 10, time.time() - 10))
+        self.cache.fetch("first", os.path.join(self.test_dir.name, "target"))
+        self.cache.max_bytes = 250
+        self.cache.store("fourth", self.source_path)
+        self.assertListEqual(sorted(os.listdir(self.cache.cache_dir)), ["first", "fourth"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class TestCli(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        code = ("import sys, pyquet.pyquet_generator, pyquet.modules.generator; "
+                "print(sorted({'pandas', 'pyarrow.dataset'} & set(sys.modules)))")
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                                text=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_help(self):
+        output = subprocess.run([sys.executable, "-m", "pyquet.pyquet_generator", "--help"],
+                                check=True, capture_output=True, text=True).stdout
+        self.assertIn("--schema-path", output)
+
+    def test_destination_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            schema_dir = os.path.join(tmp_dir, "schemas")
+            os.makedirs(schema_dir)
+            for name in ("first_table", "second_table"):
+                with open(os.path.join(schema_dir, f"{name}.json"), "w") as f:
+                    json.dump({"name": name, "fields": [{"name": "numeric_short_field",
+                                                         "logicalFormat": "NUMERIC SHORT"}]}, f)
+            destination_dir = os.path.join(tmp_dir, "output")
+            for schema_path in (os.path.join(schema_dir, "first_table.json"), schema_dir):
+                subprocess.run([sys.executable, "-m", "pyquet.pyquet_generator",
+                                "-s", schema_path, "-t", "parquet", "-d", destination_dir,
+                                "--seed", "1"], check=True, capture_output=True)
+                self.assertIn("first_table", os.listdir(destination_dir))
+            self.assertListEqual(sorted(os.listdir(destination_dir)),
+                                 ["first_table", "second_table"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import numpy as np
+import pyarrow as pa
+
+from pyquet.modules.columns import SEEDED_REFERENCE_NOW, ColumnEngine
+
+
+class TestColumnEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = {
+            "country": ["ES", "PE", "US"],
+            "cutoff_date": ["2025-01-31", "2025-02-28"],
+            "amount": [1, 2.5],
+            "start_time": ["10:00:00"]
+        }
+        self.engine = ColumnEngine(self.catalog, seed=0)
+        self.num_rows = 1000
+
+    def test_alphanumeric(self):
+        data = self.engine.alphanumeric("alphanumeric_field", self.num_rows, 10)
+        self.assertEqual(data.type, pa.string())
+        self.assertEqual(len(data), self.num_rows)
+        for value in data.to_pylist():
+            self.assertEqual(len(value), 10)
+            self.assertTrue(value.isalnum())
+
+    def test_alphanumeric_cardinality(self):
+        data = self.engine.alphanumeric("alphanumeric_field", self.num_rows, 10, cardinality=5)
+        self.assertEqual(data.type, pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(len(data), self.num_rows)
+        self.assertEqual(len(data.dictionary), 5)
+        self.assertEqual(len(set(data.to_pylist())), 5)
+
+        chunk = self.engine.alphanumeric("alphanumeric_field", 100, 10, offset=500, cardinality=5)
+        self.assertTrue(chunk.dictionary.equals(data.dictionary))
+        self.assertListEqual(chunk.to_pylist(), data.to_pylist()[500:600])
+
+        countries = self.engine.alphanumeric("country", 6, 2, cardinality=5)
+        self.assertListEqual(countries.dictionary.to_pylist(), ["ES", "PE", "US"])
+        self.assertListEqual(countries.to_pylist(), ["ES", "PE", "US", "ES", "PE", "US"])
+
+    def test_integer(self):
+        data = self.engine.integer("numeric_short_field", self.num_rows, 10)
+        self.assertEqual(data.type, pa.int64())
+        self.assertEqual(min(data.to_pylist()), 0)
+        self.assertEqual(max(data.to_pylist()), 10)
+
+    def test_decimal(self):
+        data = self.engine.decimal("decimal_field", self.num_rows, 10, 2)
+        self.assertEqual(data.type, pa.decimal128(10, 2))
+        for value in data.to_pylist():
+            self.assertIsInstance(value, Decimal)
+            self.assertLess(value, Decimal(10 ** 8))
+
+    def test_decimal_precision(self):
+        for decimal_precision, decimal_scale, decimal_type in [(18, 0, pa.decimal128(18, 0)),
+                                                              (38, 10, pa.decimal128(38, 10)),
+                                                              (60, 5, pa.decimal256(60, 5))]:
+            data = self.engine.decimal("decimal_field", self.num_rows, decimal_precision,
+                                       decimal_scale)
+            self.assertEqual(data.type, decimal_type)
+            data.validate(full=True)
+            for value in data.to_pylist():
+                self.assertGreaterEqual(value, 0)
+                self.assertLess(value, Decimal(10) ** (decimal_precision - decimal_scale))
+                self.assertLessEqual(len(value.as_tuple().digits), decimal_precision)
+
+    def test_dates(self):
+        self.assertEqual(self.engine.date("date_field", self.num_rows).type, pa.date32())
+        self.assertEqual(self.engine.timestamp("timestamp_field", self.num_rows).type,
+                         pa.timestamp("ms"))
+        self.assertEqual(self.engine.time("time_field", self.num_rows).type, pa.time32("ms"))
+
+    def test_catalog_cycling(self):
+        self.assertListEqual(self.engine.alphanumeric("country", 4, 10).to_pylist(),
+                             ["ES", "PE", "US", "ES"])
+        self.assertListEqual(self.engine.date("cutoff_date", 3).to_pylist(),
+                             [date(2025, 1, 31), date(2025, 2, 28), date(2025, 1, 31)])
+        self.assertListEqual(self.engine.decimal("amount", 2, 10, 2).to_pylist(),
+                             [Decimal("1.00"), Decimal("2.50")])
+        self.assertListEqual(self.engine.time("start_time", 2).to_pylist(),
+                             [time(10, 0), time(10, 0)])
+
+    def test_reference_now(self):
+        engine = ColumnEngine(seed=0, reference_now=datetime(2025, 1, 31, 12, 30))
+        dates = engine.date("date_field", self.num_rows).to_pylist()
+        timestamps = engine.timestamp("timestamp_field", self.num_rows).to_pylist()
+        times = engine.time("time_field", self.num_rows).to_pylist()
+        self.assertLessEqual(max(dates), date(2025, 1, 31))
+        self.assertGreaterEqual(min(dates), date(2020, 2, 1))
+        self.assertLessEqual(max(timestamps), datetime(2025, 1, 31, 12, 30))
+        self.assertGreater(min(timestamps), datetime(2020, 2, 1, 12, 30))
+        self.assertTrue(all(timestamp.microsecond == 0 for timestamp in timestamps))
+        self.assertTrue(all(value.microsecond == 0 for value in times))
+
+        self.assertEqual(ColumnEngine(seed=0).reference_now,
+                         np.datetime64(SEEDED_REFERENCE_NOW, "ms"))
+        self.assertEqual(ColumnEngine().reference_now,
+                         np.datetime64(datetime.combine(date.today(), datetime.min.time()), "ms"))
+
+    def test_catalog_date_format(self):
+        engine = ColumnEngine({"cutoff_date": ["31/01/2025", "28/02/2025"]})
+        self.assertListEqual(engine.date("cutoff_date", 3, date_format="%d/%m/%Y").to_pylist(),
+                             [date(2025, 1, 31), date(2025, 2, 28), date(2025, 1, 31)])
+
+    def test_seed(self):
+        other_engine = ColumnEngine(self.catalog, seed=0)
+        self.assertTrue(self.engine.alphanumeric("alphanumeric_field", 100, 10).equals(
+            other_engine.alphanumeric("alphanumeric_field", 100, 10)))
+        self.assertTrue(self.engine.timestamp("timestamp_field", 100).equals(
+            other_engine.timestamp("timestamp_field", 100)))
+        self.assertFalse(self.engine.integer("numeric_short_field", 100).equals(
+            self.engine.integer("other_field", 100)))
+        self.assertFalse(self.engine.integer("numeric_short_field", 100).equals(
+            ColumnEngine(self.catalog, seed=1).integer("numeric_short_field", 100)))
+
+    def test_offset(self):
+        data = self.engine.decimal("decimal_field", 200000, 30, 4)
+        self.assertTrue(data.slice(60000, 20000).equals(
+            self.engine.decimal("decimal_field", 20000, 30, 4, offset=60000)))
+        self.assertTrue(data.slice(131000, 3).equals(
+            self.engine.decimal("decimal_field", 3, 30, 4, offset=131000)))
+
+    def test_offset_rows(self):
+        rows = np.array([1, 5, 65535, 65536, 131074, 199999])
+        data = self.engine.decimal("decimal_field", 200000, 30, 4)
+        self.assertTrue(data.take(rows).equals(
+            self.engine.decimal("decimal_field", len(rows), 30, 4, offset=rows)))
+        self.assertListEqual(self.engine.alphanumeric("country", 3, offset=np.array([1, 5, 6]))
+                             .to_pylist(), ["PE", "US", "ES"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import unittest
+from datetime import date
+from unittest import mock
+
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from dataset_case import DatasetTestCase
+from pyquet.modules.editor import TableEditor
+from pyquet.modules.generator import DataGenerator
+
+
+class TestTableEditor(DatasetTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.editor = TableEditor(self.path, self.schema, ["cutoff_date"])
+
+    def _partition_files(self, cutoff_date):
+        partition_path = os.path.join(self.path, f"cutoff_date={cutoff_date}")
+        return {name: os.stat(os.path.join(partition_path, name)).st_ino
+                for name in os.listdir(partition_path)}
+
+    def _read(self):
+        return ds.dataset(self.path, partitioning="hive").to_table().to_pandas()
+
+    def test_lazy_open(self):
+        editor = TableEditor(os.path.join(self.tmp_dir.name, "missing"), self.schema,
+                             ["cutoff_date"])
+        self.assertIsNone(editor._dataset)
+        self.assertIsNone(editor._df)
+
+    def test_read(self):
+        table = self.editor.read(["numeric_short_field"],
+                                 pc.field("cutoff_date") == date(2025, 1, 31))
+        self.assertListEqual(table.column_names, ["numeric_short_field"])
+        self.assertEqual(table.num_rows, 10)
+
+        batches = list(self.editor.iter_batches(["alphanumeric_field", "cutoff_date"],
+                                                batch_rows=4))
+        self.assertLessEqual(max(batch.num_rows for batch in batches), 4)
+        self.assertEqual(sum(batch.num_rows for batch in batches), 30)
+        self.assertListEqual(batches[0].schema.names, ["alphanumeric_field", "cutoff_date"])
+        self.assertIsNone(self.editor._df)
+
+    def test_set_constants(self):
+        self.assertIs(self.editor.set_constants({"numeric_short_field": 7}), self.editor)
+
+        self.assertEqual(len(self.editor.rewritten), 3)
+        self.assertIsNone(self.editor._df)
+        df = self._read()
+        self.assertEqual(len(df), 30)
+        self.assertListEqual(df["numeric_short_field"].unique().tolist(), [7])
+        self.assertListEqual(self.editor.df["numeric_short_field"].unique().tolist(), [7])
+        self.assertListEqual(sorted(os.listdir(self.tmp_dir.name)), ["test_table"])
+
+    def test_unpartitioned(self):
+        generator = DataGenerator(num_rows=30, seed=42)
+        path, schema = generator.generate_data(
+            self.plan, "parquet", destination_path=os.path.join(self.tmp_dir.name, "flat_table"))
+        editor = TableEditor(path, schema, None)
+        file_path = os.path.join(path, os.listdir(path)[0])
+
+        self.assertListEqual(editor.set_constants({"numeric_short_field": 7}).rewritten,
+                             [file_path])
+        self.assertListEqual(editor.update({"alphanumeric_field": "x"},
+                                           pc.field("numeric_short_field") == 7), [file_path])
+        table = editor.read(["alphanumeric_field", "numeric_short_field"])
+        self.assertEqual(table.num_rows, 30)
+        self.assertListEqual(table.column("numeric_short_field").unique().to_pylist(), [7])
+        self.assertListEqual(table.column("alphanumeric_field").unique().to_pylist(), ["x"])
+
+    def test_set_constants_partition_filter(self):
+        untouched = self._partition_files("2025-02-28")
+        before = self._read()
+
+        self.editor.set_constants({"alphanumeric_field": "x"},
+                                  {"cutoff_date": ["2025-01-31", "2025-03-31"]})
+
+        self.assertEqual(len(self.editor.rewritten), 2)
+        self.assertDictEqual(self._partition_files("2025-02-28"), untouched)
+        df = self._read()
+        edited = df["cutoff_date"].astype(str) != "2025-02-28"
+        self.assertListEqual(df.loc[edited, "alphanumeric_field"].unique().tolist(), ["x"])
+        self.assertListEqual(df.loc[~edited, "alphanumeric_field"].tolist(),
+                             before.loc[~edited, "alphanumeric_field"].tolist())
+
+    def test_set_constants_partition_column(self):
+        self.editor.set_constants({"cutoff_date": "2025-02-28"}, {"cutoff_date": "2025-01-31"})
+
+        self.assertListEqual(sorted(os.listdir(self.path)),
+                             ["cutoff_date=2025-02-28", "cutoff_date=2025-03-31"])
+        self.assertEqual(len(self._partition_files("2025-02-28")), 2)
+        self.assertEqual(len(self._read()), 30)
+
+    def test_set_constants_missing_field(self):
+        files = self._partition_files("2025-01-31")
+
+        self.assertListEqual(self.editor.set_constants({"missing_field": 1}).rewritten, [])
+        self.assertDictEqual(self._partition_files("2025-01-31"), files)
+        file_path = os.path.join(self.path, "cutoff_date=2025-01-31", list(files)[0])
+        self.assertEqual(pq.read_metadata(file_path).num_rows, 10)
+
+    def test_set_constants_rename_error(self):
+        before = self._read()
+        replace = os.replace
+        calls = []
+
+        def failing_replace(source, target):
+            calls.append(target)
+            if len(calls) == 2:
+                raise PermissionError(target)
+            replace(source, target)
+
+        with mock.patch("os.replace", failing_replace):
+            self.editor.set_constants({"cutoff_date": "2025-03-31"},
+                                      {"cutoff_date": ["2025-01-31", "2025-02-28"]})
+
+        self.assertListEqual(self.editor.rewritten, [])
+        self.assertTrue(self._read().equals(before))
+        self.assertListEqual(sorted(os.listdir(self.tmp_dir.name)), ["test_table"])
+
+    def test_update(self):
+        before = self._read()
+        untouched = self._partition_files("2025-02-28")
+        numbers = before["numeric_short_field"][:4].tolist()
+        expression = ((pc.field("cutoff_date") != date(2025, 2, 28))
+                      & pc.field("numeric_short_field").isin(numbers))
+
+        rewritten = self.editor.update({"alphanumeric_field": "x"}, expression)
+
+        self.assertLessEqual(len(rewritten), 2)
+        self.assertDictEqual(self._partition_files("2025-02-28"), untouched)
+        df = self._read()
+        matched = ((before["cutoff_date"].astype(str) != "2025-02-28")
+                   & before["numeric_short_field"].isin(numbers))
+        self.assertTrue(matched.any())
+        self.assertListEqual(df.loc[matched, "alphanumeric_field"].unique().tolist(), ["x"])
+        self.assertListEqual(df.loc[~matched, "alphanumeric_field"].tolist(),
+                             before.loc[~matched, "alphanumeric_field"].tolist())
+
+    def test_update_pruning(self):
+        files = self._partition_files("2025-01-31")
+
+        self.assertListEqual(self.editor.update({"alphanumeric_field": "x"},
+                                                pc.field("numeric_short_field") > 1000), [])
+        self.assertListEqual(self.editor.update({"cutoff_date": date(2025, 2, 28)}), [])
+        self.assertDictEqual(self._partition_files("2025-01-31"), files)
+        self.assertEqual(len(self.editor.update({"numeric_short_field": 1})), 3)
+        self.assertListEqual(self._read()["numeric_short_field"].unique().tolist(), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,13 @@ import unittest
 import os
 import shutil
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from datetime import datetime
 from decimal import Decimal
-from pyquet.modules.generator import DataGenerator
+from pyquet.modules.generator import WRITERS, DataGenerator
+from pyquet.modules.plan import compile_schema
 
 
 class TestDataGenerator(unittest.TestCase):
@@ -83,6 +87,293 @@ class TestDataGenerator(unittest.TestCase):
         self.assertIn("time_field", df_csv1.columns)
 
 
+    def test_generate_data_types(self):
+        parquet_path, target_schema = self.generator.generate_data(self.schema_path, output_type="parquet")
+        file_schema = pq.read_table(parquet_path).schema
+
+        self.assertEqual(file_schema.field("decimal_field").type, pa.decimal128(10, 2))
+        self.assertEqual(file_schema.field("date_field").type, pa.date32())
+        self.assertEqual(file_schema.field("timestamp_field").type, pa.timestamp("ms"))
+        self.assertEqual(file_schema.field("time_field").type, pa.time32("ms"))
+        self.assertEqual(file_schema.remove_metadata(), target_schema)
+
+    def test_generate_dataframe(self):
+        df = self.generator.generate_dataframe(self.schema_path)
+        self.assertEqual(len(df), self.generator.num_rows)
+        self.assertListEqual(list(df.columns), [field["name"] for field in self.schema["fields"]])
+
+    def test_iter_batches(self):
+        generator = DataGenerator(num_rows=25, seed=42)
+        batches = list(generator.iter_batches(self.schema_path, batch_rows=10))
+        table = generator.to_table(self.schema_path)
+
+        self.assertListEqual([batch.num_rows for batch in batches], [10, 10, 5])
+        self.assertEqual(table.num_rows, 25)
+        self.assertTrue(pa.Table.from_batches(batches).equals(table))
+        self.assertFalse(os.path.exists(self.schema["physicalPath"]))
+
+        parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet")
+        self.assertTrue(pq.read_table(parquet_path).equals(table))
+
+    def test_generate_data_parquet_options(self):
+        generator = DataGenerator(num_rows=250, parquet_options={
+            "row_group_size": 40,
+            "max_rows_per_file": 100,
+            "compression": "zstd",
+            "use_dictionary": ["alphanumeric_field"],
+            "write_statistics": False
+        })
+        parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet")
+        files = sorted(os.listdir(parquet_path))
+        metadata = pq.ParquetFile(os.path.join(parquet_path, files[0])).metadata
+
+        self.assertEqual(len(files), 3)
+        self.assertEqual(metadata.num_rows, 100)
+        self.assertListEqual([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)],
+                             [40, 40, 20])
+        self.assertEqual(metadata.row_group(0).column(0).compression, "ZSTD")
+        self.assertIn("RLE_DICTIONARY", metadata.row_group(0).column(0).encodings)
+        self.assertNotIn("RLE_DICTIONARY", metadata.row_group(0).column(1).encodings)
+        self.assertFalse(metadata.row_group(0).column(1).is_stats_set)
+
+    def test_generate_data_chunked(self):
+        generator = DataGenerator(num_rows=25, chunk_rows=10)
+        generator.catalog["alphanumeric_field"] = ["a", "b", "c"]
+
+        csv_path, _ = generator.generate_data(self.schema_path, output_type="csv")
+        parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet")
+        df_csv = pd.read_csv(csv_path)
+        df_parquet = pd.read_parquet(parquet_path)
+
+        self.assertEqual(len(df_csv), 25)
+        self.assertEqual(len(df_parquet), 25)
+        expected = [["a", "b", "c"][counter % 3] for counter in range(25)]
+        self.assertListEqual(list(df_csv["alphanumeric_field"]), expected)
+        self.assertListEqual(list(df_parquet["alphanumeric_field"]), expected)
+
+    def test_generate_data_parallel(self):
+        generator = DataGenerator(num_rows=25, chunk_rows=4, workers=3)
+        generator.catalog["alphanumeric_field"] = ["a", "b", "c"]
+
+        csv_path, _ = generator.generate_data(self.schema_path, output_type="csv")
+        parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet")
+        df_csv = pd.read_csv(csv_path)
+        df_parquet = pd.read_parquet(parquet_path)
+
+        self.assertEqual(len(os.listdir(parquet_path)), 3)
+        expected = [["a", "b", "c"][counter % 3] for counter in range(25)]
+        self.assertListEqual(list(df_csv["alphanumeric_field"]), expected)
+        self.assertListEqual(list(df_parquet["alphanumeric_field"]), expected)
+
+    def test_generate_data_partitioned(self):
+        for workers in (1, 3):
+            generator = DataGenerator(num_rows=30, workers=workers, seed=42, partition_skew=1)
+            generator.catalog["date_field"] = ["2025-01-31", "2025-02-28"]
+            destination_path = os.path.join(self.destination_dir, str(workers))
+
+            parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                                      partitions=["date_field"],
+                                                      destination_path=destination_path)
+            df_parquet = pd.read_parquet(parquet_path)
+
+            self.assertListEqual(sorted(os.listdir(parquet_path)),
+                                 ["date_field=2025-01-31", "date_field=2025-02-28"])
+            self.assertEqual(len(df_parquet), 30)
+            self.assertListEqual(df_parquet["date_field"].astype(str).value_counts().tolist(),
+                                 [20, 10])
+            partition_path = os.path.join(parquet_path, "date_field=2025-01-31")
+            file_path = os.path.join(partition_path, os.listdir(partition_path)[0])
+            self.assertNotIn("date_field", pq.read_schema(file_path).names)
+
+    def test_generate_data_partitioned_catalog_rows(self):
+        catalog_path = os.path.join(self.tests_path, "catalog.json")
+        with open(catalog_path, "w") as f:
+            json.dump({"date_field": ["2024-01-31", "2024-02-29", "2024-03-31"],
+                       "alphanumeric_field": ["ES", "PE", "MX"]}, f)
+        generator = DataGenerator(catalog_path, seed=42)
+
+        parquet_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                                  partitions=["date_field", "alphanumeric_field"])
+        df_parquet = pd.read_parquet(parquet_path)
+
+        self.assertEqual(len(df_parquet), 3)
+        self.assertListEqual(sorted(zip(df_parquet["date_field"].astype(str),
+                                        df_parquet["alphanumeric_field"].astype(str))),
+                             [("2024-01-31", "ES"), ("2024-02-29", "PE"), ("2024-03-31", "MX")])
+
+    def test_generate_data_partitioned_catalog_pairs(self):
+        catalog_path = os.path.join(os.path.dirname(__file__), "test_data", "catalog.json")
+        schema = compile_schema({
+            "name": "test_table",
+            "fields": [{"name": "gf_cutoff_date", "logicalFormat": "DATE"},
+                       {"name": "g_country_id", "logicalFormat": "ALPHANUMERIC(2)"},
+                       {"name": "numeric_short_field", "logicalFormat": "NUMERIC SHORT"}]
+        })
+        for workers in (1, 2):
+            generator = DataGenerator(catalog_path, num_rows=12, limit_rows=False,
+                                      workers=workers, seed=42)
+            parquet_path, _ = generator.generate_data(
+                schema, output_type="parquet", partitions=["gf_cutoff_date"],
+                destination_path=os.path.join(self.destination_dir, str(workers)))
+            df_parquet = pd.read_parquet(parquet_path)
+            expected = generator.generate_dataframe(schema)
+
+            self.assertListEqual(sorted(zip(df_parquet["gf_cutoff_date"].astype(str),
+                                            df_parquet["g_country_id"].astype(str),
+                                            df_parquet["numeric_short_field"])),
+                                 sorted(zip(expected["gf_cutoff_date"].astype(str),
+                                            expected["g_country_id"],
+                                            expected["numeric_short_field"])))
+            self.assertSetEqual(set(zip(df_parquet["gf_cutoff_date"].astype(str),
+                                        df_parquet["g_country_id"].astype(str))),
+                                {("2025-01-31", "ES"), ("2025-02-28", "PE"),
+                                 ("2025-03-31", "US")})
+
+    def test_generate_data_append(self):
+        generator = DataGenerator(num_rows=30, seed=42)
+        generator.catalog["date_field"] = ["2025-01-31", "2025-02-28"]
+        full_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                               partitions=["date_field"],
+                                               destination_path=self.destination_path)
+        first_path = os.path.join(full_path, "date_field=2025-01-31")
+        first_files = os.listdir(first_path)
+        shutil.rmtree(os.path.join(full_path, "date_field=2025-02-28"))
+
+        generator.generate_data(self.schema_path, output_type="parquet", partitions=["date_field"],
+                                destination_path=self.destination_path, append=True)
+        generator.generate_data(self.schema_path, output_type="parquet", partitions=["date_field"],
+                                destination_path=self.destination_path, append=True,
+                                partition_values={"date_field": ["2025-03-31"]})
+
+        self.assertListEqual(os.listdir(first_path), first_files)
+        self.assertListEqual(sorted(os.listdir(full_path)),
+                             ["date_field=2025-01-31", "date_field=2025-02-28",
+                              "date_field=2025-03-31"])
+        self.assertEqual(len(pd.read_parquet(full_path)), 60)
+        reference_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                                    partitions=["date_field"],
+                                                    destination_dir=self.destination_dir)
+        self.assertTrue(pq.read_table(os.path.join(full_path, "date_field=2025-02-28")).equals(
+            pq.read_table(os.path.join(reference_path, "date_field=2025-02-28"))))
+
+    def test_generate_data_append_values(self):
+        generator = DataGenerator(num_rows=4, seed=42)
+        generator.catalog["date_field"] = ["2025-01-31"]
+        full_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                               partitions=["date_field"],
+                                               destination_path=self.destination_path)
+        for cutoff_date in ("2025-02-28", "2025-03-31"):
+            generator.generate_data(self.schema_path, output_type="parquet",
+                                    partitions=["date_field"],
+                                    destination_path=self.destination_path, append=True,
+                                    partition_values={"date_field": [cutoff_date]})
+
+        tables = [pq.read_table(os.path.join(full_path, f"date_field={cutoff_date}"))
+                  for cutoff_date in ("2025-01-31", "2025-02-28", "2025-03-31")]
+        self.assertListEqual([table.num_rows for table in tables], [4, 4, 4])
+        for column in ("alphanumeric_field", "numeric_short_field"):
+            values = [tuple(table.column(column).to_pylist()) for table in tables]
+            self.assertEqual(len(set(values)), 3)
+
+    def test_generate_data_cache(self):
+        cache_dir = os.path.join(self.tests_path, "cache")
+        generator = DataGenerator(num_rows=25, seed=42, cache_dir=cache_dir)
+        first_path, _ = generator.generate_data(self.schema_path, output_type="parquet")
+        second_path, _ = generator.generate_data(self.schema_path, output_type="parquet",
+                                                 destination_path=self.destination_path)
+        generator.num_rows = 30
+        generator.generate_data(self.schema_path, output_type="parquet",
+                                destination_dir=self.destination_dir)
+
+        self.assertListEqual(os.listdir(first_path), os.listdir(second_path))
+        self.assertTrue(pq.read_table(first_path).equals(pq.read_table(second_path)))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+        generator.orc_options = {"compression": "zlib"}
+        generator.generate_data(self.schema_path, output_type="orc",
+                                destination_path=os.path.join(self.tests_path, "orc_zlib"))
+        generator.orc_options = {"compression": "uncompressed"}
+        generator.generate_data(self.schema_path, output_type="orc",
+                                destination_path=os.path.join(self.tests_path, "orc_none"))
+        self.assertFalse(generator.last_stats.cached)
+        self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+    def test_generate_data_stats(self):
+        collected = []
+        generator = DataGenerator(num_rows=25, chunk_rows=10, workers=2)
+        csv_path, _ = generator.generate_data(self.schema_path, output_type="csv",
+                                              stats_callback=collected.append)
+        stats = collected[0].to_dict()
+
+        self.assertIs(collected[0], generator.last_stats)
+        self.assertEqual(stats["rows"], 25)
+        self.assertListEqual(sorted(stats["column_seconds"]),
+                             sorted(field["name"] for field in self.schema["fields"]))
+        self.assertEqual(stats["files_written"], 1)
+        self.assertEqual(stats["bytes_written"], os.path.getsize(csv_path))
+        self.assertGreater(stats["total_seconds"], 0)
+        self.assertIn("write", collected[0].format())
+
+    def test_generate_data_csv_options(self):
+        serial = DataGenerator(num_rows=25, seed=42)
+        compressed = DataGenerator(num_rows=25, chunk_rows=4, workers=3, seed=42,
+                                   csv_options={"compression": "gzip", "delimiter": ";"})
+        split = DataGenerator(num_rows=25, seed=42, csv_options={"parts": 3})
+
+        serial_path, _ = serial.generate_data(self.schema_path, output_type="csv")
+        compressed_path, _ = compressed.generate_data(self.schema_path, output_type="csv",
+                                                      destination_path=self.destination_path)
+        split_path, _ = split.generate_data(self.schema_path, output_type="csv",
+                                            destination_dir=self.destination_dir)
+        df_csv = pd.read_csv(serial_path)
+
+        self.assertEqual(compressed_path, self.destination_path + ".csv.gz")
+        pd.testing.assert_frame_equal(pd.read_csv(compressed_path, sep=";"), df_csv)
+        part_names = sorted(os.listdir(split_path))
+        self.assertListEqual(part_names, ["part-00000.csv", "part-00001.csv", "part-00002.csv"])
+        pd.testing.assert_frame_equal(
+            pd.concat([pd.read_csv(os.path.join(split_path, name)) for name in part_names],
+                      ignore_index=True), df_csv)
+
+    def test_generate_data_output_types(self):
+        generator = DataGenerator(num_rows=25, seed=42)
+        generator.catalog["date_field"] = ["2025-01-31", "2025-02-28"]
+        generator.catalog["alphanumeric_field"] = ["a", "b", "c"]
+        expected = pq.read_table(generator.generate_data(self.schema_path, "parquet")[0])
+
+        for output_type in ("ipc", "feather", "orc", "ndjson"):
+            for partitions in (None, ["date_field"], ["alphanumeric_field"]):
+                destination_path = os.path.join(self.destination_dir, output_type,
+                                                str(partitions))
+                target_path, _ = generator.generate_data(self.schema_path, output_type,
+                                                         partitions, destination_path)
+                files = [file for _, _, files in os.walk(target_path) for file in files]
+                self.assertTrue(files)
+                self.assertTrue(all(file.endswith(WRITERS[output_type][1]) for file in files))
+                if output_type == "ndjson":
+                    rows = sum(len(pd.read_json(os.path.join(root, file), lines=True))
+                               for root, _, files in os.walk(target_path) for file in files)
+                    self.assertEqual(rows, 25)
+                    continue
+                table = ds.dataset(target_path, format=output_type,
+                                   partitioning="hive" if partitions else None).to_table()
+                self.assertEqual(table.num_rows, 25)
+                if output_type != "orc" and not partitions:
+                    self.assertTrue(table.equals(expected))
+
+    def test_generate_data_seed(self):
+        serial = DataGenerator(num_rows=25, seed=42)
+        parallel = DataGenerator(num_rows=25, chunk_rows=4, workers=3, seed=42)
+
+        serial_path, _ = serial.generate_data(self.schema_path, output_type="csv")
+        with open(serial_path) as f:
+            serial_csv = f.read()
+        parallel_path, _ = parallel.generate_data(self.schema_path, output_type="csv")
+        with open(parallel_path) as f:
+            parallel_csv = f.read()
+
+        self.assertEqual(serial_csv, parallel_csv)
+
     def test_generate_alphanumeric(self):
         data = self.generator.generate_alphanumeric("alphanumeric_field", 10)
         self.assertEqual(len(data), self.generator.num_rows)
@@ -0,0 +1,116 @@
+import os
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from dataset_case import DatasetTestCase
+from pyquet.modules.editor import FieldNotFoundException
+from pyquet.modules.pager import DatasetPager
+
+
+class TestDatasetPager(DatasetTestCase):
+
+    def test_metadata(self):
+        pager = DatasetPager(self.path, page_rows=7)
+        self.assertListEqual(pager.schema.names,
+                             ["alphanumeric_field", "numeric_short_field", "cutoff_date"])
+        self.assertEqual(pager.schema.field("cutoff_date").type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        self.assertListEqual(pager.partitions, ["cutoff_date"])
+        self.assertEqual(pager.num_rows, 30)
+        self.assertEqual(pager.num_pages, 5)
+        self.assertTrue(pager.complete)
+        self.assertFalse(DatasetPager(self.path, ["numeric_short_field"]).complete)
+        self.assertFalse(DatasetPager(self.path, partition_filter={"cutoff_date": "2025-02-28"})
+                         .complete)
+
+    def test_page(self):
+        pager = DatasetPager(self.path, page_rows=7)
+        pages = [pager.page(index) for index in range(pager.num_pages)]
+
+        self.assertListEqual([page.num_rows for page in pages], [7, 7, 7, 7, 2])
+        self.assertListEqual(pa.concat_tables(pages).column("numeric_short_field").to_pylist(),
+                             self.table.column("numeric_short_field").to_pylist())
+        self.assertEqual(pager.page(5).num_rows, 0)
+        self.assertListEqual(pager.read(3, 13).column("alphanumeric_field").to_pylist(),
+                             self.table.column("alphanumeric_field").to_pylist()[3:13])
+
+    def test_columns_and_partition_filter(self):
+        pager = DatasetPager(self.path, ["numeric_short_field", "cutoff_date"],
+                             {"cutoff_date": "2025-02-28"}, page_rows=10)
+        page = pager.page(0)
+
+        self.assertEqual(pager.num_rows, 10)
+        self.assertListEqual(page.column_names, ["numeric_short_field", "cutoff_date"])
+        self.assertListEqual(page.column("cutoff_date").to_pylist(), ["2025-02-28"] * 10)
+        self.assertListEqual(page.column("numeric_short_field").to_pylist(),
+                             self.table.column("numeric_short_field").to_pylist()[10:20])
+        with self.assertRaises(FieldNotFoundException):
+            DatasetPager(self.path, partition_filter={"numeric_short_field": [1]})
+
+    def test_rewrite(self):
+        pager = DatasetPager(self.path, ["numeric_short_field", "cutoff_date"], page_rows=10)
+        loaded = pa.concat_tables([pager.page(0), pager.page(1)])
+        edited = loaded.set_column(0, "numeric_short_field",
+                                   pa.array([-1] * 20, type=pa.int64()))
+        files = {fragment.path: os.stat(fragment.path).st_ino for fragment in pager.fragments}
+        first_file = pager.fragments[0].path
+
+        rewritten = pager.rewrite([3], edited)
+
+        self.assertListEqual(rewritten, [first_file])
+        self.assertListEqual([path for path, inode in files.items()
+                              if os.stat(path).st_ino != inode], [first_file])
+        self.assertEqual(pq.read_metadata(first_file).row_group(0).num_rows, 4)
+        table = ds.dataset(self.path, partitioning="hive").to_table()
+        expected = self.table.column("numeric_short_field").to_pylist()
+        expected[:10] = [-1] * 10
+        self.assertListEqual(table.column("numeric_short_field").to_pylist(), expected)
+        self.assertListEqual(table.column("alphanumeric_field").to_pylist(),
+                             self.table.column("alphanumeric_field").to_pylist())
+        self.assertListEqual(pager.page(0).column("numeric_short_field").to_pylist(), [-1] * 10)
+        self.assertListEqual(sorted(os.listdir(os.path.dirname(first_file))),
+                             [os.path.basename(first_file)])
+        self.assertListEqual(os.listdir(self.tmp_dir.name), ["test_table"])
+
+    def test_save_dataframe(self):
+        pager = DatasetPager(self.path, ["numeric_short_field", "alphanumeric_field"],
+                             page_rows=7)
+        df = pager.page_dataframe(0).sort_values("numeric_short_field")
+        df = pd.concat([df, pager.page_dataframe(1)])
+        df.loc[df.index[0], "alphanumeric_field"] = "sorted"
+        df.loc[12, "numeric_short_field"] = -1
+        files = [fragment.path for fragment in pager.fragments]
+
+        rewritten = pager.save_dataframe(df)
+
+        self.assertListEqual(rewritten, files[:2])
+        table = ds.dataset(self.path, partitioning="hive").to_table()
+        expected = self.table.to_pydict()
+        expected["alphanumeric_field"][int(df.index[0])] = "sorted"
+        expected["numeric_short_field"][12] = -1
+        self.assertDictEqual(table.to_pydict(), expected)
+        self.assertListEqual(pager.save_dataframe(pager.page_dataframe(0)), [])
+        with self.assertRaises(ValueError):
+            pager.save_dataframe(df.drop(index=3))
+
+    def test_save_dataframe_partition_column(self):
+        pager = DatasetPager(self.path, page_rows=10)
+        df = pager.page_dataframe(0)
+        df["cutoff_date"] = df["cutoff_date"].astype(str)
+        df.loc[0, "cutoff_date"] = "2025-02-28"
+        files = {fragment.path: os.stat(fragment.path).st_ino for fragment in pager.fragments}
+
+        with self.assertRaisesRegex(ValueError, "cutoff_date"):
+            pager.save_dataframe(df, pa.schema([pa.field(name, pa.string())
+                                                if name == "cutoff_date"
+                                                else pager.schema.field(name)
+                                                for name in pager.columns]))
+        self.assertDictEqual({path: os.stat(path).st_ino for path in files}, files)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+from pyquet.modules.columns import ColumnEngine
+from pyquet.modules.partitions import (VALUE_ROW_SPACE, existing_partitions,
+                                       partition_row_indices, plan_partitions, split_rows)
+from pyquet.modules.plan import compile_schema
+
+
+class TestPartitions(unittest.TestCase):
+
+    def setUp(self):
+        self.plan = compile_schema({
+            "name": "test_table",
+            "fields": [
+                {"name": "alphanumeric_field", "logicalFormat": "ALPHANUMERIC(10)"},
+                {"name": "cutoff_date", "logicalFormat": "DATE"},
+                {"name": "country", "logicalFormat": "ALPHANUMERIC(2)"}
+            ]
+        })
+        self.engine = ColumnEngine({"cutoff_date": ["2025-01-31", "2025-02-28", "2025-01-31"],
+                                    "country": ["ES", "PE"]}, seed=0)
+
+    def test_split_rows(self):
+        self.assertListEqual(split_rows(10, 3), [4, 3, 3])
+        self.assertListEqual(split_rows(100, 4, 1), [48, 24, 16, 12])
+        self.assertListEqual(split_rows(2, 4), [1, 1, 0, 0])
+
+    def _plan(self, *args, **kwargs):
+        planned = plan_partitions(self.plan, *args, **kwargs)
+        if planned is None:
+            return None
+        return [(directory, positions.tolist(), stride, count)
+                for directory, positions, stride, count in planned]
+
+    def test_plan_partitions(self):
+        self.assertListEqual(self._plan(self.engine, ["cutoff_date"], 5),
+                             [("cutoff_date=2025-01-31", [0, 2], 3, 3),
+                              ("cutoff_date=2025-02-28", [1], 3, 2)])
+        self.assertListEqual(self._plan(self.engine, ["cutoff_date", "country"], 8),
+                             [("cutoff_date=2025-01-31/country=ES", [0, 2], 6, 3),
+                              ("cutoff_date=2025-02-28/country=PE", [1], 6, 2),
+                              ("cutoff_date=2025-01-31/country=PE", [3, 5], 6, 2),
+                              ("cutoff_date=2025-02-28/country=ES", [4], 6, 1)])
+        self.assertIsNone(self._plan(self.engine, ["alphanumeric_field"], 5))
+
+    def test_plan_partitions_catalog_rows(self):
+        engine = ColumnEngine({"cutoff_date": ["2024-01-31", "2024-02-29", "2024-03-31"],
+                               "country": ["ES", "PE", "MX"]}, seed=0)
+        self.assertListEqual(self._plan(engine, ["cutoff_date", "country"], 3),
+                             [("cutoff_date=2024-01-31/country=ES", [0], 3, 1),
+                              ("cutoff_date=2024-02-29/country=PE", [1], 3, 1),
+                              ("cutoff_date=2024-03-31/country=MX", [2], 3, 1)])
+        self.assertEqual(len(self._plan(engine, ["cutoff_date", "country"], 30, skew=1)), 3)
+
+    def test_partition_row_indices(self):
+        self.assertListEqual(partition_row_indices(np.array([0, 2]), 3, 0, 5).tolist(),
+                             [0, 2, 3, 5, 6])
+        self.assertListEqual(partition_row_indices(np.array([3, 5]), 6, 1, 4).tolist(),
+                             [5, 9, 11])
+
+    def test_partition_rows(self):
+        self.assertListEqual(self._plan(self.engine, ["cutoff_date"], 5, 7),
+                             [("cutoff_date=2025-01-31", [0, 2], 3, 7),
+                              ("cutoff_date=2025-02-28", [1], 3, 7)])
+        partition_rows = {"2025-02-28,PE": 3, ("2025-01-31", "ES"): 2}
+        self.assertListEqual(self._plan(self.engine, ["cutoff_date", "country"], 5,
+                                        partition_rows),
+                             [("cutoff_date=2025-01-31/country=ES", [0, 2], 6, 2),
+                              ("cutoff_date=2025-02-28/country=PE", [1], 6, 3)])
+
+    def test_skip_and_values(self):
+        self.assertListEqual(self._plan(self.engine, ["cutoff_date"], 5,
+                                        skip={"cutoff_date=2025-01-31"}),
+                             [("cutoff_date=2025-02-28", [1], 3, 2)])
+        self.assertListEqual(self._plan(self.engine, ["alphanumeric_field"], 4,
+                                        values={"alphanumeric_field": ["a b", "c"]}),
+                             [("alphanumeric_field=a%20b",
+                               [zlib.crc32(b"alphanumeric_field=a%20b") * VALUE_ROW_SPACE], 1, 2),
+                              ("alphanumeric_field=c",
+                               [zlib.crc32(b"alphanumeric_field=c") * VALUE_ROW_SPACE], 1, 2)])
+
+    def test_existing_partitions(self):
+        with tempfile.TemporaryDirectory() as target_path:
+            self.assertSetEqual(existing_partitions(os.path.join(target_path, "missing"),
+                                                    ["cutoff_date"]), set())
+            for directory in ("cutoff_date=2025-01-31/country=ES", "cutoff_date=2025-01-31/x=1",
+                              "cutoff_date=2025-02-28/country=PE"):
+                os.makedirs(os.path.join(target_path, directory))
+                open(os.path.join(target_path, directory, "part-0.parquet"), "w").close()
+            os.makedirs(os.path.join(target_path, "cutoff_date=2025-03-31", "country=ES"))
+            self.assertSetEqual(existing_partitions(target_path, ["cutoff_date", "country"]),
+                                {"cutoff_date=2025-01-31/country=ES",
+                                 "cutoff_date=2025-02-28/country=PE"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pyarrow as pa
+
+from pyquet.modules.plan import compile_schema, load_plan
+
+
+class TestSchemaPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.schema_path = os.path.join(self.test_dir.name, "schema.json")
+        self.schema = {
+            "name": "test_table",
+            "physicalPath": "test_table",
+            "fields": [
+                {"name": "alphanumeric_field", "logicalFormat": "ALPHANUMERIC(10)"},
+                {"name": "numeric_short_field", "logicalFormat": "NUMERIC SHORT"},
+                {"name": "decimal_field", "logicalFormat": "DECIMAL(10,2)"},
+                {"name": "integer_decimal_field", "logicalFormat": "DECIMAL(5)"},
+                {"name": "date_field", "logicalFormat": "DATE"},
+                {"name": "timestamp_field", "logicalFormat": "TIMESTAMP"},
+                {"name": "time_field", "logicalFormat": "TIME"},
+                {"name": "unknown_field", "logicalFormat": "CLOB"}
+            ]
+        }
+        with open(self.schema_path, "w") as f:
+            json.dump(self.schema, f)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_compile_schema(self):
+        plan = compile_schema(self.schema)
+        self.assertEqual(plan.arrow_schema, pa.schema([
+            ("alphanumeric_field", pa.string()),
+            ("numeric_short_field", pa.int64()),
+            ("decimal_field", pa.decimal128(10, 2)),
+            ("integer_decimal_field", pa.decimal128(5, 0)),
+            ("date_field", pa.date32()),
+            ("timestamp_field", pa.timestamp("ms")),
+            ("time_field", pa.time32("ms"))
+        ]))
+        self.assertEqual(plan.name, "test_table")
+
+    def test_compile_schema_cardinality(self):
+        self.schema["fields"][0]["cardinality"] = 100
+        plan = compile_schema(self.schema)
+        self.assertEqual(plan.arrow_schema.field("alphanumeric_field").type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(plan.fields[0].kwargs, {"size": 10, "cardinality": 100})
+
+    def test_compile_schema_cache(self):
+        self.assertIs(compile_schema(self.schema), compile_schema(json.loads(json.dumps(self.schema))))
+
+    def test_load_plan_cache(self):
+        plan = load_plan(self.schema_path)
+        self.assertIs(load_plan(self.schema_path), plan)
+
+        self.schema["fields"] = self.schema["fields"][:1]
+        with open(self.schema_path, "w") as f:
+            json.dump(self.schema, f)
+        os.utime(self.schema_path, ns=(0, 0))
+        self.assertEqual(len(load_plan(self.schema_path).fields), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
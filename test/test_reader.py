@@ -64,6 +64,15 @@ class ReaderTestCase(unittest.TestCase):
             self.assertDictEqual(self.reader.schemas_dict[path], data)
         self.assertNotIn(self.bad_schema, self.reader.schemas_dict)
 
+    def test_get_plan(self):
+        schema = {"name": "table", "fields": [{"name": "field", "logicalFormat": "DATE"}]}
+        with open(self.schema_1, 'w') as f:
+            json.dump(schema, f)
+        self.reader = Reader(self.schema_1)
+        plan = self.reader.get_plan(self.schema_1)
+        self.assertEqual(plan.name, "table")
+        self.assertListEqual([field.name for field in plan.fields], ["field"])
+
 if __name__ == '__main__':
     with open('test-reports/results.xml', 'wb') as output:
         unittest.main(verbosity=2)
\ No newline at end of file